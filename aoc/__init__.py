@@ -0,0 +1,4 @@
+"""
+Tooling shared by the dayNN solutions: discovery, benchmarking and friends.
+Run `python -m aoc --help` for the available commands.
+"""
@@ -0,0 +1,276 @@
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from aoc import batch, bench, bundle, generate, loader, profiling, results, runner, server
+from aoc.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+from aoc.days import Day, select_days
+from aoc.memory import MIB, MemoryTracking
+from aoc.parsed_cache import DEFAULT_PARSED_CACHE_DIR, ParsedInputCache
+
+
+def _add_common_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--days", type=int, nargs="+", default=None,
+                        help="days to run (default: all dayNN directories)")
+    parser.add_argument("--input", default="input.txt",
+                        help="input file name inside each day directory, or an absolute path")
+    parser.add_argument("--parsed-cache", action="store_true",
+                        help="load parsed inputs from a binary cache (days defining pack_input)")
+    parser.add_argument("--parsed-cache-dir", default=DEFAULT_PARSED_CACHE_DIR)
+
+
+def _parsed_cache(args: argparse.Namespace) -> Optional[ParsedInputCache]:
+    if not args.parsed_cache:
+        return None
+    return ParsedInputCache(args.parsed_cache_dir)
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    days = select_days(args.days)
+    stats = bench.run(days, args.input, args.repeat, args.variants, _parsed_cache(args),
+                      args.cold_start or args.bundle is not None, args.bundle)
+    print(bench.format_table(stats))
+
+    if args.save:
+        store = results.ResultStore(args.profile, args.results_dir)
+        store.add_run(stats, args.input, args.label)
+        store.save()
+        print(f"results saved to {store.path}")
+    return 0
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    store = results.ResultStore(args.profile, args.results_dir)
+    base, head = store.find(args.base), store.find(args.head)
+    report, regressions = results.format_comparison(results.compare(base, head), base, head,
+                                                    args.threshold, args.alpha)
+    print(report)
+    return 1 if regressions > 0 else 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    days = select_days(args.days)
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_size)
+
+    start = time.perf_counter()
+    memory = None
+    if args.memory or args.memory_budget is not None:
+        budget = None if args.memory_budget is None else int(args.memory_budget * MIB)
+        memory = MemoryTracking(budget, args.memory_top)
+
+    results = runner.run(days, args.input, args.variants, args.jobs, cache, _parsed_cache(args), memory,
+                         report=lambda result: print(result.get_str(), flush=True))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(result.failed() for result in results)
+    print(f"{len(results)} jobs, {failed} failed, {elapsed:.2f} s wall time")
+    return 1 if failed > 0 else 0
+
+
+def _cmd_profile(args: argparse.Namespace) -> int:
+    day = Day(args.day)
+
+    if not args.counters_only:
+        suffix = "callgrind" if args.callgrind else "prof"
+        out_path = args.out or f"day{args.day:02d}_part{args.part}.{suffix}"
+        print(profiling.profile(day, args.part, args.input, out_path, args.top, args.sort, args.callgrind))
+        print(f"profile written to {out_path}")
+
+    counts = profiling.count(day, args.part, args.input)
+    for name, value in counts.items():
+        print(f"{name}: {value}")
+    return 0
+
+
+def _cmd_batch(args: argparse.Namespace) -> int:
+    day = Day(args.day)
+    paths = batch.input_paths(args.source)
+    failed = batch.run(day, paths, sys.stdout, args.parts, args.chunk_size,
+                       report=lambda line: print(line, file=sys.stderr))
+    return 1 if failed > 0 else 0
+
+
+def _cmd_stream(args: argparse.Namespace) -> int:
+    day = Day(args.day)
+    solve_stream = day.stream_solver()
+    if solve_stream is None:
+        print(f"day {args.day} has no streaming mode", file=sys.stderr)
+        return 2
+
+    if args.input_path == "-":
+        answers = solve_stream(loader.stream_lines(sys.stdin.buffer))
+    else:
+        with open(args.input_path, "rb") as file_handle:
+            answers = solve_stream(loader.stream_lines(file_handle))
+    for answer in answers:
+        print(answer)
+    return 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    server.serve(args.host, args.port, args.unix, args.workers)
+    return 0
+
+
+def _cmd_client(args: argparse.Namespace) -> int:
+    client = server.Client(args.host, args.port, args.unix)
+    try:
+        if args.metrics:
+            print(json.dumps(client.metrics(), indent=2))
+            return 0
+        if args.day is None or args.part is None or args.input_path is None:
+            print("day, part and input are required unless --metrics is given", file=sys.stderr)
+            return 2
+
+        if args.input_path == "-":
+            data = sys.stdin.buffer.read()
+        else:
+            with open(args.input_path, "rb") as file_handle:
+                data = file_handle.read()
+        print(client.solve(args.day, args.part, data))
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+    return 0
+
+
+def _add_store_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", default=None,
+                        help="machine profile of the results store (default: host-arch-python version)")
+    parser.add_argument("--results-dir", default=results.DEFAULT_RESULTS_DIR)
+
+
+def _add_address_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default=server.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Unix socket path, used instead of --host/--port")
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    days = select_days(args.days)
+    for path in generate.generate_inputs(days, args.size, args.seed, args.out_dir):
+        print(path)
+    return 0
+
+
+def _cmd_bundle(args: argparse.Namespace) -> int:
+    names = bundle.build(args.out, args.days)
+    print(f"{len(names)} modules bundled into {args.out}, run with: python {args.out} DAY INPUT [PART ...]")
+    return 0
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = subparsers.add_parser("bench", help="time parse, solve1 and solve2 for every day")
+    _add_common_args(bench_parser)
+    bench_parser.add_argument("--repeat", type=int, default=3, help="timed runs per phase")
+    bench_parser.add_argument("--variants", action="store_true",
+                              help="also run alternative solvers such as day22 solve2_v2")
+    bench_parser.add_argument("--save", action="store_true",
+                              help="append the timings to the results store of this machine profile")
+    bench_parser.add_argument("--label", default=None, help="name of the saved run, for compare")
+    bench_parser.add_argument("--cold-start", action="store_true",
+                              help="also time fresh interpreters importing and running each day")
+    bench_parser.add_argument("--bundle", default=None,
+                              help="also time running each day from this bundle (implies --cold-start)")
+    _add_store_args(bench_parser)
+    bench_parser.set_defaults(func=_cmd_bench)
+
+    compare_parser = subparsers.add_parser("compare",
+                                           help="flag (day, phase) pairs that got slower between two saved runs")
+    _add_store_args(compare_parser)
+    compare_parser.add_argument("--base", default="-2", help="label or history index of the base run (default: -2)")
+    compare_parser.add_argument("--head", default="-1", help="label or history index of the new run (default: -1)")
+    compare_parser.add_argument("--threshold", type=float, default=results.DEFAULT_THRESHOLD,
+                                help="relative slowdown of the median that counts as a regression")
+    compare_parser.add_argument("--alpha", type=float, default=results.DEFAULT_ALPHA,
+                                help="significance level of the one-sided Mann-Whitney U test")
+    compare_parser.set_defaults(func=_cmd_compare)
+
+    run_parser = subparsers.add_parser("run", help="solve every (day, part) and print the answers")
+    _add_common_args(run_parser)
+    run_parser.add_argument("--jobs", type=int, default=None,
+                            help="worker processes (default: core count, 1 runs in-process)")
+    run_parser.add_argument("--variants", action="store_true",
+                            help="also run alternative solvers such as day22 solve2_v2")
+    run_parser.add_argument("--no-cache", action="store_true", help="always solve, bypassing the answer cache")
+    run_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    run_parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES,
+                            help="cache size cap in bytes, least recently used answers are evicted")
+    run_parser.add_argument("--memory", action="store_true",
+                            help="report peak memory and top allocation sites per (day, part); slows solvers down")
+    run_parser.add_argument("--memory-budget", type=float, default=None,
+                            help="abort any solver using more than this many MiB (implies --memory)")
+    run_parser.add_argument("--memory-top", type=int, default=3, help="allocation sites shown per (day, part)")
+    run_parser.set_defaults(func=_cmd_run)
+
+    profile_parser = subparsers.add_parser("profile", help="profile one (day, part) and count inner-loop calls")
+    profile_parser.add_argument("day", type=int)
+    profile_parser.add_argument("part")
+    profile_parser.add_argument("--input", default="input.txt",
+                                help="input file name inside the day directory, or an absolute path")
+    profile_parser.add_argument("--out", default=None, help="profile output path (default: dayNN_partP.prof)")
+    profile_parser.add_argument("--top", type=int, default=20, help="functions shown in the summary")
+    profile_parser.add_argument("--sort", default="cumulative", help="pstats sort key of the summary")
+    profile_parser.add_argument("--callgrind", action="store_true",
+                                help="write callgrind format (needs pyprof2calltree) instead of pstats")
+    profile_parser.add_argument("--counters-only", action="store_true",
+                                help="skip cProfile and only report the inner-loop counters")
+    profile_parser.set_defaults(func=_cmd_profile)
+
+    batch_parser = subparsers.add_parser("batch", help="solve many inputs of one day, answers as JSON lines")
+    batch_parser.add_argument("day", type=int)
+    batch_parser.add_argument("source", help="directory of inputs, or a manifest listing one input path per line")
+    batch_parser.add_argument("--parts", nargs="+", default=None, help="parts to solve (default: 1 2)")
+    batch_parser.add_argument("--chunk-size", type=int, default=batch.DEFAULT_CHUNK_SIZE,
+                              help="inputs parsed and solved together")
+    batch_parser.set_defaults(func=_cmd_batch)
+
+    stream_parser = subparsers.add_parser("stream", help="solve both parts of a line-oriented day in one pass "
+                                                         "over a stream, in bounded memory")
+    stream_parser.add_argument("day", type=int)
+    stream_parser.add_argument("input_path", nargs="?", default="-", help="input file (default: - for stdin)")
+    stream_parser.set_defaults(func=_cmd_stream)
+
+    serve_parser = subparsers.add_parser("serve", help="keep all days loaded and answer inputs over a socket")
+    _add_address_args(serve_parser)
+    serve_parser.add_argument("--workers", type=int, default=server.DEFAULT_WORKERS,
+                              help="worker threads handling connections")
+    serve_parser.set_defaults(func=_cmd_serve)
+
+    client_parser = subparsers.add_parser("client", help="ask a running server for an answer or its metrics")
+    client_parser.add_argument("day", type=int, nargs="?")
+    client_parser.add_argument("part", nargs="?")
+    client_parser.add_argument("input_path", nargs="?", help="input file, - for stdin")
+    _add_address_args(client_parser)
+    client_parser.add_argument("--metrics", action="store_true", help="print the per (day, part) latencies")
+    client_parser.set_defaults(func=_cmd_client)
+
+    generate_parser = subparsers.add_parser("generate", help="write synthetic inputs of a given size")
+    generate_parser.add_argument("--days", type=int, nargs="+", default=None,
+                                 help="days to generate inputs for (default: all)")
+    generate_parser.add_argument("--size", type=int, required=True,
+                                 help="size of the input, see each dayNN/generate.py for its meaning")
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--out-dir", default="generated")
+    generate_parser.set_defaults(func=_cmd_generate)
+
+    bundle_parser = subparsers.add_parser("bundle", help="compile the aoc package and all days into one zipapp")
+    bundle_parser.add_argument("--out", default=bundle.DEFAULT_BUNDLE_PATH)
+    bundle_parser.add_argument("--days", type=int, nargs="+", default=None,
+                               help="days to bundle (default: all)")
+    bundle_parser.set_defaults(func=_cmd_bundle)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+"""
+Batch mode: many different inputs of one day in a single process.
+
+Imports and any per-day setup are paid once. Inputs are parsed and solved
+in chunks; a day can solve a whole chunk at once by defining
+`solveN_batch(inputs)`, which takes the list of parsed inputs (the solver
+argument tuples) and returns the list of answers. Days without one are
+solved input by input. Tables a batch solver builds regardless of the input
+are built on first use, or up front by the day's `precompute()`.
+
+Answers are streamed back as JSON lines, one per (input, part), in input
+order.
+"""
+import json
+import os
+import time
+import traceback
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from aoc.cache import to_json
+from aoc.days import Day
+
+
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def input_paths(source: str) -> List[str]:
+    """
+    A directory yields every file in it, sorted by name. Anything else is
+    read as a manifest: one input path per line, relative to the manifest,
+    blank lines and #-comments skipped.
+    """
+    if os.path.isdir(source):
+        return sorted(entry.path for entry in os.scandir(source) if entry.is_file())
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, "r") as file_handle:
+        for line in file_handle:
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+            paths.append(os.path.join(base_dir, line))
+    return paths
+
+
+def _record(path: str, part: str, answer: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+    if error is not None:
+        return {"input": path, "part": part, "error": error}
+    return {"input": path, "part": part, "answer": to_json(answer)}
+
+
+def _solve_one(day: Day, part: str, args: Tuple) -> Tuple[Any, Optional[str]]:
+    try:
+        return day.solve(part, args), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def _solve_chunk(day: Day, part: str, inputs: List[Tuple]) -> List[Tuple[Any, Optional[str]]]:
+    batch_solver = day.batch_solver(part)
+    if batch_solver is not None:
+        try:
+            return [(answer, None) for answer in batch_solver(inputs)]
+        except Exception:
+            # Fall back to one by one, which pins the error on the failing input
+            pass
+    return [_solve_one(day, part, args) for args in inputs]
+
+
+def _chunks(paths: List[str], chunk_size: int) -> Iterator[List[str]]:
+    for i in range(0, len(paths), chunk_size):
+        yield paths[i:i+chunk_size]
+
+
+def solve_batch(day: Day, paths: List[str], parts: Optional[List[str]] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    if parts is None:
+        parts = day.parts()
+
+    for chunk in _chunks(paths, chunk_size):
+        parsed = []
+        parse_errors = {}
+        for path in chunk:
+            try:
+                parsed.append((path, day.parse(path)))
+            except Exception:
+                parse_errors[path] = traceback.format_exc()
+
+        answers = {}
+        for part in parts:
+            results = _solve_chunk(day, part, [args for _, args in parsed])
+            for (path, _), result in zip(parsed, results):
+                answers[path, part] = result
+
+        for path in chunk:
+            for part in parts:
+                if path in parse_errors:
+                    yield _record(path, part, error=parse_errors[path])
+                else:
+                    answer, error = answers[path, part]
+                    yield _record(path, part, answer, error)
+
+
+def run(day: Day, paths: List[str], out: TextIO, parts: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE, report: Optional[Callable[[str], None]] = None) -> int:
+    """
+    Writes the JSON lines to `out` and returns the number of failed
+    records. The throughput is passed to `report` at the end.
+    """
+    start = time.perf_counter()
+    failed = 0
+    for record in solve_batch(day, paths, parts, chunk_size):
+        failed += "error" in record
+        out.write(json.dumps(record) + "\n")
+    out.flush()
+    elapsed = time.perf_counter() - start
+
+    if report is not None:
+        rate = len(paths) / elapsed if elapsed > 0 else float("inf")
+        report(f"{len(paths)} inputs, {failed} failed, {elapsed:.2f} s ({rate:.1f} inputs/s)")
+    return failed
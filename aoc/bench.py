@@ -0,0 +1,192 @@
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aoc.days import ROOT_DIR, Day, day_dir
+from aoc.parsed_cache import ParsedInputCache
+
+
+PARSE_PHASE = "parse"
+# Cold-start phases, each timing a fresh interpreter
+IMPORT_PHASE = "import"
+COLD_PHASE = "cold"
+BUNDLE_PHASE = "bundle"
+
+
+class PhaseStats:
+    day: int
+    phase: str
+    timings: List[float]
+    peak_memory: int
+
+    def __init__(self, day: int, phase: str, timings: List[float], peak_memory: int) -> None:
+        self.day = day
+        self.phase = phase
+        self.timings = timings
+        self.peak_memory = peak_memory
+
+    def min(self) -> float:
+        return min(self.timings)
+
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    def p95(self) -> float:
+        return percentile(self.timings, 95)
+
+
+def percentile(values: List[float], p: float) -> float:
+    # Nearest-rank percentile, which stays meaningful for a handful of samples
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _measure_peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _time_phase(day: Day, phase: str, run: Callable[[], object], repeat: int) -> PhaseStats:
+    """
+    Times run `repeat` times. The peak memory is taken from one extra run
+    under tracemalloc, which would otherwise distort the timings.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    peak_memory = _measure_peak_memory(run)
+
+    return PhaseStats(day.number, phase, timings, peak_memory)
+
+
+def bench_parse(day: Day, path: str, repeat: int,
+                parsed_cache: Optional[ParsedInputCache] = None) -> Tuple[PhaseStats, Tuple]:
+    """
+    Times the parse phase and returns the prepared input with it. With a
+    parsed input cache, it times the reload from the cache, which is filled
+    beforehand.
+    """
+    if parsed_cache is not None:
+        parse = lambda: parsed_cache.parse(day, path)
+    else:
+        parse = lambda: day.parse(path)
+
+    args = parse()
+    return _time_phase(day, PARSE_PHASE, parse, repeat), args
+
+
+def bench_solve(day: Day, part: str, args: Tuple, repeat: int) -> PhaseStats:
+    # Solvers leave the prepared input untouched, so every run shares args
+    return _time_phase(day, part, lambda: day.solve(part, args), repeat)
+
+
+# Runs a script or zipapp (argv[1]) as __main__, or only imports it, and
+# reports the peak resident set of its own address space. The child's
+# ru_maxrss would not do: the kernel carries the forking parent's
+# high-water mark over the exec.
+_CHILD_SOURCE = """\
+import runpy, sys
+run_name, sys.argv = sys.argv[1], sys.argv[2:]
+try:
+    runpy.run_path(sys.argv[0], run_name=run_name)
+finally:
+    try:
+        with open("/proc/self/status") as file_handle:
+            hwm = next(line.split()[1] for line in file_handle if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        hwm = "0"
+    sys.stderr.write(f"\\npeak_rss_kib {hwm}\\n")
+"""
+
+
+def _run_child(command: List[str]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, cwd=ROOT_DIR, text=True)
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with status {process.returncode}:\n{process.stderr}")
+    peak_rss = int(process.stderr.rsplit("peak_rss_kib", 1)[1]) * 1024
+    return elapsed, peak_rss
+
+
+def cold_start_commands(day: Day, path: str, bundle_path: Optional[str] = None) -> Dict[str, List[str]]:
+    script = os.path.join(day_dir(day.number), "solution.py")
+    child = [sys.executable, "-c", _CHILD_SOURCE]
+    commands = {
+        # The script's imports alone, skipping its __main__ block
+        IMPORT_PHASE: child + ["<run_path>", script],
+        COLD_PHASE: child + ["__main__", script, path],
+    }
+    if bundle_path is not None:
+        commands[BUNDLE_PHASE] = child + ["__main__", os.path.abspath(bundle_path), str(day.number), path]
+    return commands
+
+
+def bench_cold_start(day: Day, path: str, repeat: int, bundle_path: Optional[str] = None) -> List[PhaseStats]:
+    """
+    Times fresh interpreters importing the day, running its script end to
+    end and, given a bundle (see aoc.bundle), running it from the bundle.
+    The peak memory of these phases is the child's peak resident set,
+    interpreter included, rather than the traced heap.
+    """
+    all_stats = []
+    for phase, command in cold_start_commands(day, path, bundle_path).items():
+        timings = []
+        peak_memory = 0
+        for _ in range(repeat):
+            elapsed, max_rss = _run_child(command)
+            timings.append(elapsed)
+            peak_memory = max(peak_memory, max_rss)
+        all_stats.append(PhaseStats(day.number, phase, timings, peak_memory))
+    return all_stats
+
+
+def bench_day(day: Day, input_file: str, repeat: int, variants: bool = False,
+              parsed_cache: Optional[ParsedInputCache] = None, cold_start: bool = False,
+              bundle_path: Optional[str] = None) -> List[PhaseStats]:
+    path = day.input_path(input_file)
+
+    # Parsed once, the prepared input is shared by all parts
+    parse_stats, args = bench_parse(day, path, repeat, parsed_cache)
+    all_stats = [parse_stats] + [bench_solve(day, part, args, repeat) for part in day.parts(variants)]
+    if cold_start:
+        all_stats += bench_cold_start(day, os.path.abspath(path), repeat, bundle_path)
+    return all_stats
+
+
+def format_table(stats: List[PhaseStats]) -> str:
+    header = f"{'day':>4} {'phase':<8} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'peak KiB':>10}"
+    lines = [header, "-" * len(header)]
+    for s in stats:
+        lines.append(
+            f"{s.day:>4} {s.phase:<8} {s.min() * 1e3:>10.2f} {s.median() * 1e3:>10.2f} "
+            f"{s.p95() * 1e3:>10.2f} {s.peak_memory / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def run(days: List[Day], input_file: str, repeat: int, variants: bool = False,
+        parsed_cache: Optional[ParsedInputCache] = None, cold_start: bool = False,
+        bundle_path: Optional[str] = None,
+        report: Optional[Callable[[PhaseStats], None]] = None) -> List[PhaseStats]:
+    all_stats = []
+    for day in days:
+        for stats in bench_day(day, input_file, repeat, variants, parsed_cache, cold_start, bundle_path):
+            all_stats.append(stats)
+            if report is not None:
+                report(stats)
+    return all_stats
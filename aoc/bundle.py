@@ -0,0 +1,103 @@
+"""
+Single-file bundle of the tooling and every day's solution.
+
+`build` writes a zipapp holding bytecode only: the aoc package, and each
+dayNN/solution.py as a top-level `dayNN_solution` module (the name
+load_module gives it), all compiled ahead of time. Running
+
+    python aoc.pyz DAY INPUT [PART ...]
+
+imports the day straight from the archive and prints its answers, one per
+line, instead of scanning the source tree and compiling whatever has no
+up-to-date __pycache__ entry. The .pyc files are unchecked hash based, so
+nothing is compared against a source at import; rebuild the bundle after
+changing a solution.
+"""
+import importlib
+import os
+import sys
+from typing import TYPE_CHECKING, List, Optional
+
+from aoc.days import ROOT_DIR, Day, discover_days, day_dir
+
+if TYPE_CHECKING:
+    import zipfile
+
+
+DEFAULT_BUNDLE_PATH = "aoc.pyz"
+
+_MAIN_SOURCE = """\
+import sys
+from aoc.bundle import main
+sys.exit(main(sys.argv[1:]))
+"""
+
+
+def _write_compiled(archive: 'zipfile.ZipFile', source_path: str, name: str, tmp_dir: str) -> None:
+    import py_compile
+
+    # Tracebacks show the path relative to the repository
+    display_path = os.path.relpath(source_path, ROOT_DIR)
+    compiled_path = py_compile.compile(source_path, cfile=os.path.join(tmp_dir, name), dfile=display_path,
+                                       doraise=True,
+                                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    archive.write(compiled_path, name)
+
+
+def build(out_path: str = DEFAULT_BUNDLE_PATH, days: Optional[List[int]] = None) -> List[str]:
+    """
+    Writes the bundle and returns the names of the modules in it.
+    """
+    # Imported here rather than at the top, where they would add to the
+    # startup of every bundled run
+    import glob
+    import tempfile
+    import zipfile
+
+    if days is None:
+        days = discover_days()
+
+    names = []
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with tempfile.TemporaryDirectory() as tmp_dir, zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as archive:
+        # Uncompressed: the archive is small and inflating would cost every start
+        main_path = os.path.join(tmp_dir, "__main__.py")
+        with open(main_path, "w") as file_handle:
+            file_handle.write(_MAIN_SOURCE)
+        _write_compiled(archive, main_path, "__main__.pyc", tmp_dir)
+
+        package_dir = os.path.join(ROOT_DIR, "aoc")
+        for source_path in sorted(glob.glob(os.path.join(package_dir, "*.py"))):
+            name = f"aoc/{os.path.basename(source_path)}c"
+            _write_compiled(archive, source_path, name, tmp_dir)
+            names.append(name)
+
+        for day in days:
+            name = f"day{day:02d}_solution.pyc"
+            _write_compiled(archive, os.path.join(day_dir(day), "solution.py"), name, tmp_dir)
+            names.append(name)
+    os.replace(tmp_path, out_path)
+    return names
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2 or not argv[0].isdigit():
+        print(f"usage: python {sys.argv[0]} DAY INPUT [PART ...]", file=sys.stderr)
+        return 2
+    day_number, input_path, parts = int(argv[0]), argv[1], argv[2:]
+
+    module_name = f"day{day_number:02d}_solution"
+    try:
+        # Registers the bundled module, which load_module then returns
+        importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if e.name != module_name:
+            raise
+        print(f"day {day_number} is not in the bundle", file=sys.stderr)
+        return 1
+    day = Day(day_number)
+
+    args = day.parse(input_path)
+    for part in parts or day.parts():
+        print(day.solve(part, args))
+    return 0
@@ -0,0 +1,107 @@
+"""
+Content-addressed on-disk cache of answers.
+
+An answer is keyed by the SHA-256 of the input file, the SHA-256 of the
+day's sources (its solution.py, the aoc modules it imports, such as
+loader.py and grid.py, and days.py, which prepares the solver arguments)
+and the part, so editing any of them invalidates it.
+Entries are small JSON files; their modification time is bumped on every hit
+and the least recently used ones are evicted once the cache exceeds its size
+cap.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from aoc import loader
+from aoc.days import ROOT_DIR, Day
+
+
+DEFAULT_CACHE_DIR = os.path.join(ROOT_DIR, ".aoc_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    with loader.mapped(path) as buf:
+        return hashlib.sha256(buf).hexdigest()
+
+
+def source_digest(day: Day) -> str:
+    h = hashlib.sha256()
+    for path in day.source_files():
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+def to_json(answer: Any) -> Any:
+    # NumPy scalars (day22 part 1) are not JSON serializable
+    if hasattr(answer, "item"):
+        return answer.item()
+    return answer
+
+
+class ResultCache:
+    cache_dir: str
+    max_bytes: int
+    source_digests: Dict[int, str]
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.source_digests = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, day: Day, part: str, input_path: str) -> str:
+        if day.number not in self.source_digests:
+            self.source_digests[day.number] = source_digest(day)
+
+        h = hashlib.sha256()
+        h.update(file_digest(input_path).encode())
+        h.update(self.source_digests[day.number].encode())
+        h.update(part.encode())
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as file_handle:
+                entry = json.load(file_handle)
+        except (OSError, ValueError):
+            return None
+
+        os.utime(path)  # Mark as recently used
+        return entry["answer"]
+
+    def put(self, key: str, answer: Any) -> None:
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file_handle:
+            json.dump({"answer": to_json(answer)}, file_handle)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        # Least recently used first
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
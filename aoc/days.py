@@ -0,0 +1,191 @@
+import ast
+import importlib.util
+import os
+import re
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc import loader
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DAY_DIR_PATTERN = re.compile(r"^day(\d{2})$")
+SOLVER_PATTERN = re.compile(r"^solve(\d+)(_v\d+)?$")
+
+# Parts that are run unless variants are explicitly requested
+DEFAULT_PARTS = ("1", "2")
+
+
+def day_dir(day: int) -> str:
+    return os.path.join(ROOT_DIR, f"day{day:02d}")
+
+
+def discover_days() -> List[int]:
+    days = []
+    for name in os.listdir(ROOT_DIR):
+        match = DAY_DIR_PATTERN.match(name)
+        if match is not None and os.path.isfile(os.path.join(ROOT_DIR, name, "solution.py")):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def load_module(day: int, name: str = "solution") -> ModuleType:
+    module_name = f"day{day:02d}_{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    path = os.path.join(day_dir(day), f"{name}.py")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _aoc_imports(path: str) -> List[str]:
+    # Names of the aoc modules the source at path imports
+    with open(path, "r") as file_handle:
+        tree = ast.parse(file_handle.read(), path)
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+            if node.module == "aoc":
+                names.extend(f"aoc.{alias.name}" for alias in node.names)
+            elif node.module.startswith("aoc."):
+                names.append(node.module)
+        elif isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names if alias.name.startswith("aoc."))
+    return names
+
+
+"""
+Parsing
+
+Every day follows `solveN(read_input(path))`. What read_input returns is the
+day's prepared input: it is computed once and shared by all parts, so
+solvers must not mutate it. Its NumPy arrays are made read-only, as those
+loaded from the parsed cache are anyway. Solvers that need scratch state
+copy it explicitly (day18's numbers, day22's ranges).
+
+The exceptions are handled here:
+- read_input returning a tuple (day04, day13, day14, day21) is unpacked into
+  the solver arguments,
+- day16 needs the packet tree built on top of read_input.
+"""
+
+
+def as_args(parsed: Any) -> Tuple:
+    # What read_input returned, as solver arguments
+    if isinstance(parsed, tuple):
+        return parsed
+    return (parsed,)
+
+
+def freeze(value: Any) -> None:
+    # Makes the arrays among the solver arguments, and among the attributes
+    # of objects there (Grid.cells), read-only
+    if isinstance(value, tuple):
+        for item in value:
+            freeze(item)
+        return
+    flags = getattr(value, "flags", None)
+    if flags is not None and hasattr(flags, "writeable"):
+        flags.writeable = False
+    elif hasattr(value, "__dict__") and not isinstance(value, (type, ModuleType)):
+        for attribute in vars(value).values():
+            freeze(attribute)
+
+
+def _parse_default(module: ModuleType, path: str) -> Tuple:
+    return as_args(module.read_input(path))
+
+
+def _parse_packet_tree(module: ModuleType, path: str) -> Tuple:
+    return (module.build_packet_tree(module.read_input(path)),)
+
+
+PARSE_OVERRIDES: Dict[int, Callable[[ModuleType, str], Tuple]] = {
+    16: _parse_packet_tree,
+}
+
+
+class Day:
+    number: int
+    module: ModuleType
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.module = load_module(number)
+
+    def input_path(self, file_name: str = "input.txt") -> str:
+        if os.path.isabs(file_name):
+            return file_name
+        return os.path.join(day_dir(self.number), file_name)
+
+    def source_files(self) -> List[str]:
+        """
+        solution.py and the aoc modules it imports, directly or through one
+        another: the day's parsing and solving live in all of them (e.g.
+        loader.py and grid.py parse the grid days). This module is one of
+        them too, as it turns the parsed input into the solver arguments.
+        """
+        solution_path = self.module.__file__
+        paths = {os.path.abspath(__file__)}
+        pending = [solution_path, os.path.abspath(__file__)]
+        while len(pending) > 0:
+            for name in _aoc_imports(pending.pop()):
+                path = os.path.join(ROOT_DIR, *name.split(".")) + ".py"
+                if path not in paths and os.path.isfile(path):
+                    paths.add(path)
+                    pending.append(path)
+        return [solution_path] + sorted(paths)
+
+    def parse(self, path: loader.Source) -> Tuple:
+        parse_fn = PARSE_OVERRIDES.get(self.number, _parse_default)
+        args = parse_fn(self.module, path)
+        freeze(args)
+        return args
+
+    def parts(self, variants: bool = False) -> List[str]:
+        parts = []
+        for name in dir(self.module):
+            match = SOLVER_PATTERN.match(name)
+            if match is None:
+                continue
+            part = name[len("solve"):]
+            if variants or part in DEFAULT_PARTS:
+                parts.append(part)
+        return sorted(parts)
+
+    def solver(self, part: str) -> Callable:
+        return getattr(self.module, f"solve{part}")
+
+    def batch_solver(self, part: str) -> Optional[Callable]:
+        # solveN_batch takes a list of parsed inputs and returns their answers
+        return getattr(self.module, f"solve{part}_batch", None)
+
+    def stream_solver(self) -> Optional[Callable]:
+        # solve_stream folds the lines of a stream into the answers of both parts
+        return getattr(self.module, "solve_stream", None)
+
+    def precompute(self) -> None:
+        # Builds the input independent tables of the batch solvers up front
+        precompute_fn = getattr(self.module, "precompute", None)
+        if precompute_fn is not None:
+            precompute_fn()
+
+    def solve(self, part: str, args: Tuple) -> Any:
+        return self.solver(part)(*args)
+
+
+def select_days(days: Optional[List[int]]) -> List[Day]:
+    available = discover_days()
+    if days is None:
+        days = available
+    unknown = sorted(set(days) - set(available))
+    if len(unknown) > 0:
+        raise ValueError(f"Unknown days: {unknown}")
+    return [Day(day) for day in days]
@@ -0,0 +1,28 @@
+import os
+import random
+from typing import List
+
+from aoc.days import Day, day_dir, load_module
+
+
+def has_generator(day: Day) -> bool:
+    return os.path.isfile(os.path.join(day_dir(day.number), "generate.py"))
+
+
+def generate_input(day: Day, path: str, size: int, seed: int) -> None:
+    module = load_module(day.number, "generate")
+    with open(path, "w") as file_handle:
+        module.generate(file_handle, size, random.Random(seed))
+
+
+def generate_inputs(days: List[Day], size: int, seed: int, out_dir: str) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = []
+    for day in days:
+        if not has_generator(day):
+            continue
+        path = os.path.join(out_dir, f"day{day.number:02d}_{size}.txt")
+        generate_input(day, path, size, seed)
+        paths.append(path)
+    return paths
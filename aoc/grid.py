@@ -0,0 +1,109 @@
+"""
+Dense 2D grids backed by a contiguous NumPy array.
+
+Neighbourhoods are taken as shifted views of a padded copy of the grid, so
+a whole-grid neighbour comparison is a handful of vectorized operations
+without any bounds checks. For the searches that stay scalar (BFS, Dijkstra)
+`flat_offsets` gives the neighbour offsets into the flattened padded grid,
+where the padding takes over the role of the bounds checks.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from aoc.loader import Buffer
+
+
+Offset = Tuple[int, int]
+
+NEIGHBORS_4: Tuple[Offset, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+NEIGHBORS_8: Tuple[Offset, ...] = tuple((di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if (di, dj) != (0, 0))
+# Row-major 3x3 window including the cell itself
+WINDOW_3X3: Tuple[Offset, ...] = tuple((di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1))
+
+NEWLINE = ord("\n")
+
+
+def _char_matrix(buf: Buffer, start: int = 0) -> np.ndarray:
+    # Views the lines of buf[start:] as an uint8 matrix, the line breaks cut off
+    end = len(buf)
+    while end > start and buf[end - 1] == NEWLINE:
+        end -= 1
+    if end == start:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    width = buf.find(b"\n", start, end)
+    width = end - start if width == -1 else width - start
+
+    # Include one line break after the last row so that every row has the same stride
+    if end < len(buf):
+        chars = np.frombuffer(buf, dtype=np.uint8, count=end + 1 - start, offset=start)
+    else:
+        chars = np.append(np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start), np.uint8(NEWLINE))
+
+    if len(chars) % (width + 1) != 0:
+        raise ValueError("All rows of a grid must have the same width")
+    return chars.reshape(-1, width + 1)[:, :width]
+
+
+class Grid:
+    cells: np.ndarray
+
+    def __init__(self, cells: np.ndarray) -> None:
+        assert cells.ndim == 2
+        self.cells = np.ascontiguousarray(cells)
+
+    @staticmethod
+    def from_digits(buf: Buffer, start: int = 0) -> 'Grid':
+        return Grid((_char_matrix(buf, start) - ord("0")).astype(np.int64))
+
+    @staticmethod
+    def from_chars(buf: Buffer, char: str, start: int = 0) -> 'Grid':
+        # True wherever the character is `char`
+        return Grid(_char_matrix(buf, start) == ord(char))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.cells.shape
+
+    def padded(self, fill, width: int = 1) -> np.ndarray:
+        return np.pad(self.cells, width, constant_values=fill)
+
+    def border_mask(self) -> np.ndarray:
+        # Shaped like padded(...): 1 on the padding, 0 on the grid itself
+        return np.pad(np.zeros(self.shape, dtype=np.uint8), 1, constant_values=1)
+
+    def shifted(self, offsets: Sequence[Offset], fill) -> List[np.ndarray]:
+        """
+        For every (di, dj), a view whose [i, j] is the cell at (i+di, j+dj),
+        or `fill` outside the grid.
+        """
+        n, m = self.shape
+        padded = self.padded(fill)
+        return [padded[1+di:1+di+n, 1+dj:1+dj+m] for di, dj in offsets]
+
+    def neighbors(self, connectivity: int = 4, fill=0) -> List[np.ndarray]:
+        assert connectivity in (4, 8)
+        return self.shifted(NEIGHBORS_4 if connectivity == 4 else NEIGHBORS_8, fill)
+
+    def flat_offsets(self, offsets: Sequence[Offset]) -> List[int]:
+        # Offsets into padded(...).ravel(), a row being two cells wider
+        stride = self.shape[1] + 2
+        return [di * stride + dj for di, dj in offsets]
+
+    def flat_index(self, i: int, j: int) -> int:
+        # Index of cell (i, j) in padded(...).ravel()
+        return (i + 1) * (self.shape[1] + 2) + (j + 1)
+
+    def tile(self, reps_rows: int, reps_cols: int, increment: int = 0) -> 'Grid':
+        """
+        Repeats the grid reps_rows x reps_cols times, adding `increment` per
+        tile step down or right.
+        """
+        n, m = self.shape
+        tiled = np.tile(self.cells, (reps_rows, reps_cols))
+        if increment != 0:
+            block_rows = np.arange(n * reps_rows) // n
+            block_cols = np.arange(m * reps_cols) // m
+            tiled += increment * (block_rows[:, None] + block_cols[None, :]).astype(tiled.dtype)
+        return Grid(tiled)
@@ -0,0 +1,27 @@
+"""
+Deferred imports of heavy modules.
+
+`lazy_import("numpy")` returns the module right away but only executes it
+on first attribute access, so scripts that never reach the code using it
+(e.g. day22 part 2 without the numpy based part 1) skip the import cost.
+Annotations naming the module's types have to be quoted, as evaluating
+them would trigger the import.
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,161 @@
+"""
+Memory-mapped input loading shared by the read_input functions.
+
+The input is mapped instead of read. Byte-level parsers get lines as
+memoryview slices of the mapping, and text lines are decoded chunk by chunk,
+so the file is never copied as a whole before it is parsed into its final
+form.
+
+Wherever a path is taken, the input may also be given as its bytes (the
+solver server receives inputs over a socket rather than as files).
+"""
+import contextlib
+import mmap
+import os
+import re
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+Buffer = Union[bytes, mmap.mmap]
+# A file path, or the input itself
+Source = Union[str, bytes]
+
+INT_PATTERN = re.compile(rb"-?\d+")
+NEWLINE = b"\n"
+CHUNK_SIZE = 1 << 24
+# Smaller, as the decoded lines of a whole chunk are alive at once
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+@contextlib.contextmanager
+def mapped(path: Source) -> Iterator[Buffer]:
+    if isinstance(path, bytes):
+        yield path
+        return
+
+    with open(path, "rb") as file_handle:
+        if os.fstat(file_handle.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            yield b""
+            return
+        with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def lines(buf: Buffer, start: int = 0, end: Optional[int] = None) -> Iterator[memoryview]:
+    """
+    Yields the lines of buf[start:end] without their line break. Each line is
+    a view into the buffer that is only valid until the next line is
+    requested; convert it (int(line), str(line, "ascii"), ...) to keep it.
+    """
+    if end is None:
+        end = len(buf)
+
+    with memoryview(buf) as view:
+        while start < end:
+            line_end = buf.find(NEWLINE, start, end)
+            if line_end == -1:
+                line_end = end
+
+            line = view[start:line_end]
+            try:
+                yield line
+            finally:
+                # The mapping cannot be closed while views into it are alive
+                line.release()
+
+            start = line_end + 1
+
+
+def chunk_bounds(buf: Buffer, chunk_size: int = CHUNK_SIZE, start: int = 0,
+                 end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    # Splits buf[start:end] into (start, end) ranges of about chunk_size bytes
+    # that end on line boundaries
+    if end is None:
+        end = len(buf)
+
+    while start < end:
+        chunk_end = min(end, start + chunk_size)
+        if chunk_end < end:
+            line_end = buf.find(NEWLINE, chunk_end - 1, end)
+            chunk_end = end if line_end == -1 else line_end + 1
+        yield start, chunk_end
+        start = chunk_end
+
+
+def str_lines(buf: Buffer, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    # Decoding a chunk at once is far cheaper than decoding line by line
+    for chunk_start, chunk_end in chunk_bounds(buf, CHUNK_SIZE, start, end):
+        yield from str(buf[chunk_start:chunk_end], "ascii").splitlines()
+
+
+def stream_lines(file_handle: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields the lines of a stream (stdin, a pipe) read chunk by chunk, so
+    memory stays bounded by the chunk size however long the stream is.
+    """
+    rest = b""
+    while True:
+        chunk = file_handle.read(chunk_size)
+        if len(chunk) == 0:
+            break
+        chunk = rest + chunk
+        last_line_end = chunk.rfind(NEWLINE)
+        if last_line_end == -1:
+            rest = chunk
+            continue
+        rest = chunk[last_line_end + 1:]
+        yield from str(chunk[:last_line_end], "ascii").splitlines()
+    if len(rest) > 0:
+        yield str(rest, "ascii")
+
+
+def parse_ints(buf: Buffer, start: int = 0, end: Optional[int] = None) -> List[int]:
+    # All integers in buf[start:end], regardless of separators
+    if end is None:
+        end = len(buf)
+    return list(map(int, INT_PATTERN.findall(buf, start, end)))
+
+
+def parse_int_array(chunk: bytes) -> 'np.ndarray':
+    # Whitespace separated integers, parsed by NumPy. It reads a lone 0 out
+    # of blank input, so that has to be caught first
+    if len(chunk) == 0 or chunk.isspace():
+        return np.zeros(0, dtype=np.int64)
+    return np.fromstring(chunk, dtype=np.int64, sep=" ")
+
+
+def parse_int_tuples(buf: Buffer, arity: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, ...]]:
+    nums = parse_ints(buf, start, end)
+    assert len(nums) % arity == 0
+    return list(zip(*[iter(nums)] * arity))
+
+
+def read_lines(path: Source) -> List[str]:
+    with mapped(path) as buf:
+        return list(str_lines(buf))
+
+
+def read_int_lines(path: Source) -> List[int]:
+    # One integer per line
+    nums = []
+    with mapped(path) as buf:
+        for start, end in chunk_bounds(buf):
+            nums.extend(map(int, buf[start:end].split()))
+    return nums
+
+
+def read_comma_ints(path: Source) -> List[int]:
+    # A single line of comma-separated integers
+    with mapped(path) as buf:
+        return parse_ints(buf)
+
+
+def read_int_tuples(path: Source, arity: int) -> List[Tuple[int, ...]]:
+    # Lines of `arity` integers each, such as "x,y" or "x1,y1 -> x2,y2"
+    with mapped(path) as buf:
+        return parse_int_tuples(buf, arity)
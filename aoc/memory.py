@@ -0,0 +1,152 @@
+"""
+Memory accounting of a single solver run.
+
+While the solver runs, a sampler thread polls the traced Python heap
+(tracemalloc, which NumPy reports its buffers to as well) and the
+process's resident set. Whenever the heap reaches a new high, by a margin,
+it takes a snapshot, so the top allocation sites are those near the peak
+rather than whatever is still alive at the end.
+
+With a budget, the sampler interrupts the solver as soon as the traced
+heap exceeds it. The resident set is reported but not held against the
+budget, as it includes tracemalloc's own bookkeeping. The interrupt only
+reaches the main thread, between bytecodes: a single huge NumPy
+allocation is not stopped halfway. Solvers finishing within a sample
+interval have no snapshot.
+"""
+import _thread
+import os
+import resource
+import threading
+import tracemalloc
+from typing import Any, Callable, List, Optional, Tuple
+
+
+MIB = 1024 * 1024
+SAMPLE_INTERVAL = 0.01
+# Snapshots are costly, so a new one is only taken past this growth
+SNAPSHOT_GROWTH = 1.25
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm", "r") as file_handle:
+            return int(file_handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs: the high-water mark is the closest there is
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryStats:
+    peak_traced: int
+    peak_rss_growth: int
+    peak_blocks: int
+    # (file:line, bytes, blocks), largest first
+    top_sites: List[Tuple[str, int, int]]
+
+    def __init__(self, peak_traced: int, peak_rss_growth: int, peak_blocks: int,
+                 top_sites: List[Tuple[str, int, int]]) -> None:
+        self.peak_traced = peak_traced
+        self.peak_rss_growth = peak_rss_growth
+        self.peak_blocks = peak_blocks
+        self.top_sites = top_sites
+
+    def get_str(self) -> str:
+        lines = [f"peak {self.peak_traced / MIB:.1f} MiB traced in {self.peak_blocks} blocks, "
+                 f"RSS +{self.peak_rss_growth / MIB:.1f} MiB"]
+        for site, size, count in self.top_sites:
+            lines.append(f"  {size / 1024:10.1f} KiB {count:>9} blocks  {site}")
+        return "\n".join(lines)
+
+
+class _Sampler(threading.Thread):
+    budget: Optional[int]
+    start_rss: int
+    peak_rss_growth: int
+    snapshot: Optional[tracemalloc.Snapshot]
+    snapshot_size: int
+    exceeded: Optional[int]
+    stopped: threading.Event
+
+    def __init__(self, budget: Optional[int]) -> None:
+        super().__init__(daemon=True)
+        self.budget = budget
+        self.start_rss = _rss()
+        self.peak_rss_growth = 0
+        self.snapshot = None
+        self.snapshot_size = 0
+        self.exceeded = None
+        self.stopped = threading.Event()
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        rss_growth = _rss() - self.start_rss
+        self.peak_rss_growth = max(self.peak_rss_growth, rss_growth)
+
+        if current > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+        if self.budget is not None and current > self.budget and self.exceeded is None:
+            self.exceeded = current
+            _thread.interrupt_main()
+
+    def run(self) -> None:
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+
+def _top_sites(snapshot: Optional[tracemalloc.Snapshot], top: int) -> Tuple[int, List[Tuple[str, int, int]]]:
+    if snapshot is None:
+        return 0, []
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    stats = snapshot.statistics("lineno")
+    blocks = sum(stat.count for stat in stats)
+    sites = [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+             for stat in stats[:top]]
+    return blocks, sites
+
+
+class MemoryTracking:
+    budget: Optional[int]
+    top: int
+
+    def __init__(self, budget: Optional[int] = None, top: int = 3) -> None:
+        self.budget = budget
+        self.top = top
+
+    def measure(self, fn: Callable[[], Any]) -> Tuple[Any, MemoryStats]:
+        """
+        Runs fn and returns its result with the memory it took. Raises
+        MemoryBudgetExceeded once fn goes over the budget; the budget is
+        only enforced when called from the main thread.
+        """
+        budget = self.budget if threading.current_thread() is threading.main_thread() else None
+
+        tracemalloc.start()
+        sampler = _Sampler(budget)
+        sampler.start()
+        try:
+            result = fn()
+            sampler.sample()
+        except KeyboardInterrupt:
+            if sampler.exceeded is None:
+                raise
+            raise MemoryBudgetExceeded(f"memory budget of {self.budget / MIB:.1f} MiB exceeded "
+                                       f"({sampler.exceeded / MIB:.1f} MiB in use)") from None
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+            _, peak_traced = tracemalloc.get_traced_memory()
+            peak_blocks, top_sites = _top_sites(sampler.snapshot, self.top)
+            tracemalloc.stop()
+
+        return result, MemoryStats(peak_traced, sampler.peak_rss_growth, peak_blocks, top_sites)
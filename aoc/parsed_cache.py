@@ -0,0 +1,134 @@
+"""
+On-disk cache of parsed inputs in binary form.
+
+Days that define `pack_input(*parsed) -> Dict[str, np.ndarray]` and
+`unpack_input(arrays)` (the inverse, returning what read_input returns)
+get their parsed input stored as one .npy file per array. Later loads map
+the arrays read-only instead of parsing the text again; the prepared input
+is never mutated, so the solvers work on the mapping directly.
+
+Entries are keyed by the SHA-256 of the input and of the day's sources:
+solution.py, which holds the packing, and the aoc modules it imports, which
+hold much of the parsing (loader.py, and grid.py for the grid days).
+Hashing a multi-GB input would cost more than the reload itself, so the
+input digests are remembered by path, size and modification time.
+"""
+import contextlib
+import gc
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Iterator, Optional, Tuple
+
+from aoc.cache import DEFAULT_CACHE_DIR, file_digest, source_digest
+from aoc.days import Day, as_args, freeze
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+DEFAULT_PARSED_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "parsed")
+DIGESTS_FILE = "digests.json"
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Unpacking into Python lists creates millions of small containers,
+    # each allocation counting towards another (pointless) GC pass
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def has_packing(day: Day) -> bool:
+    return hasattr(day.module, "pack_input") and hasattr(day.module, "unpack_input")
+
+
+class ParsedInputCache:
+    cache_dir: str
+    digests: Dict[str, Tuple[int, int, str]]
+    source_digests: Dict[int, str]
+
+    def __init__(self, cache_dir: str = DEFAULT_PARSED_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self.digests = {}
+        self.source_digests = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _digests_path(self) -> str:
+        return os.path.join(self.cache_dir, DIGESTS_FILE)
+
+    def _input_digest(self, path: str) -> str:
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+
+        if len(self.digests) == 0:
+            try:
+                with open(self._digests_path(), "r") as file_handle:
+                    self.digests = {p: tuple(entry) for p, entry in json.load(file_handle).items()}
+            except (OSError, ValueError):
+                pass
+
+        entry = self.digests.get(path)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            return entry[2]
+
+        digest = file_digest(path)
+        self.digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        tmp_path = f"{self._digests_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file_handle:
+            json.dump(self.digests, file_handle)
+        os.replace(tmp_path, self._digests_path())
+        return digest
+
+    def key(self, day: Day, path: str) -> str:
+        if day.number not in self.source_digests:
+            self.source_digests[day.number] = source_digest(day)
+
+        h = hashlib.sha256()
+        h.update(self._input_digest(path).encode())
+        h.update(self.source_digests[day.number].encode())
+        return h.hexdigest()
+
+    def _load(self, entry_dir: str) -> 'Optional[Dict[str, np.ndarray]]':
+        try:
+            names = os.listdir(entry_dir)
+        except FileNotFoundError:
+            return None
+        return {name[:-len(".npy")]: np.load(os.path.join(entry_dir, name), mmap_mode="r")
+                for name in names if name.endswith(".npy")}
+
+    def _store(self, entry_dir: str, arrays: 'Dict[str, np.ndarray]') -> None:
+        # Written next to the entry and renamed into place, so readers never
+        # see a partial entry
+        tmp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def parse(self, day: Day, path: str) -> Tuple:
+        if not has_packing(day):
+            return day.parse(path)
+
+        entry_dir = os.path.join(self.cache_dir, f"day{day.number:02d}", self.key(day, path))
+        arrays = self._load(entry_dir)
+        if arrays is not None:
+            with _gc_paused():
+                args = as_args(day.module.unpack_input(arrays))
+            # unpack_input may have copied the mapped arrays
+            freeze(args)
+            return args
+
+        args = day.parse(path)
+        self._store(entry_dir, day.module.pack_input(*args))
+        return args
@@ -0,0 +1,107 @@
+"""
+Profiling of a single (day, part).
+
+`profile` runs the part under cProfile, writes the raw stats (pstats or,
+with pyprof2calltree installed, callgrind format) and returns a top-N
+summary. `count` runs it with lightweight call counters patched onto the
+known inner loops, which costs far less than a full profile.
+"""
+import contextlib
+import cProfile
+import io
+import pstats
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from aoc.days import Day
+
+
+# Counter name -> function or method to count, relative to the day's module
+COUNTERS: Dict[int, Dict[str, str]] = {
+    12: {
+        "dfs calls": "_all_paths_dfs",
+    },
+    15: {
+        "heap pushes": "heapq.heappush",
+        "heap pops": "heapq.heappop",
+    },
+    18: {
+        "additions": "Pair.add",
+        "explosions": "Pair._explode",
+        "splits": "RegularNumber._split",
+    },
+    22: {
+        "interval updates": "CubeIntervalTree.update_interval",
+        "node splits": "CubeIntervalTree._split",
+    },
+}
+
+
+def _counting(fn: Callable, counts: Dict[str, int], name: str) -> Callable:
+    def counted(*args, **kwargs):
+        counts[name] += 1
+        return fn(*args, **kwargs)
+    return counted
+
+
+@contextlib.contextmanager
+def counters(day: Day) -> Iterator[Dict[str, int]]:
+    """
+    Patches counting wrappers onto the day's known inner loops for the
+    duration of the block. Recursive functions are counted on every call,
+    as the recursion goes through the patched module attribute.
+    """
+    counts = {}
+    patched = []
+    try:
+        for name, target in COUNTERS.get(day.number, {}).items():
+            *owner_path, attr = target.split(".")
+            owner = day.module
+            for owner_name in owner_path:
+                owner = getattr(owner, owner_name)
+
+            original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+            counts[name] = 0
+            setattr(owner, attr, _counting(original, counts, name))
+            patched.append((owner, attr, original))
+        yield counts
+    finally:
+        for owner, attr, original in reversed(patched):
+            setattr(owner, attr, original)
+
+
+def count(day: Day, part: str, input_file: str) -> Dict[str, int]:
+    args = day.parse(day.input_path(input_file))
+    with counters(day) as counts:
+        day.solve(part, args)
+    return dict(counts)
+
+
+def _write_callgrind(stats: pstats.Stats, out_path: str) -> None:
+    try:
+        from pyprof2calltree import convert
+    except ImportError:
+        raise RuntimeError("Writing callgrind files requires pyprof2calltree (pip install pyprof2calltree)")
+    convert(stats, out_path)
+
+
+def profile(day: Day, part: str, input_file: str, out_path: str, top: int = 20,
+            sort: str = "cumulative", callgrind: bool = False) -> str:
+    args = day.parse(day.input_path(input_file))
+
+    profiler = cProfile.Profile()
+    answer: Optional[Any] = None
+    profiler.enable()
+    try:
+        answer = day.solve(part, args)
+    finally:
+        profiler.disable()
+
+    if callgrind:
+        _write_callgrind(pstats.Stats(profiler), out_path)
+    else:
+        profiler.dump_stats(out_path)
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return f"answer: {answer}\n{summary.getvalue()}"
@@ -0,0 +1,195 @@
+"""
+Store of benchmark results, one JSON file per machine profile.
+
+Timings are only comparable on the same machine, so every profile (by
+default the host name, CPU architecture and Python version) has its own
+file under benchmarks/ holding the history of saved bench runs. `compare`
+flags the (day, phase) pairs whose median got slower than a threshold
+between two runs. A one-sided Mann-Whitney U test must also say the
+slowdown is significant, so noise between runs is not reported.
+"""
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+from aoc.bench import PhaseStats
+from aoc.days import ROOT_DIR
+
+
+DEFAULT_RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks")
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+# Above this many orderings the U distribution is approximated as normal
+EXACT_U_LIMIT = 100000
+
+
+def default_profile() -> str:
+    return f"{platform.node()}-{platform.machine()}-py{platform.python_version()}"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _phase_key(day: int, phase: str) -> str:
+    return f"{day:02d}/{phase}"
+
+
+class ResultStore:
+    path: str
+    profile: str
+    runs: List[Dict[str, Any]]
+
+    def __init__(self, profile: Optional[str] = None, results_dir: str = DEFAULT_RESULTS_DIR) -> None:
+        self.profile = profile or default_profile()
+        self.path = os.path.join(results_dir, f"{self.profile}.json")
+        self.runs = []
+        if os.path.isfile(self.path):
+            with open(self.path, "r") as file_handle:
+                self.runs = json.load(file_handle)["runs"]
+
+    def add_run(self, stats: List[PhaseStats], input_file: str, label: Optional[str] = None) -> Dict[str, Any]:
+        run = {
+            "label": label,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "input": input_file,
+            "timings": {_phase_key(s.day, s.phase): s.timings for s in stats},
+        }
+        self.runs.append(run)
+        return run
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        machine = {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file_handle:
+            json.dump({"profile": self.profile, "machine": machine, "runs": self.runs}, file_handle, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def find(self, ref: str) -> Dict[str, Any]:
+        """
+        A run by label, or by index into the history (-1 being the latest).
+        """
+        for run in reversed(self.runs):
+            if run["label"] == ref:
+                return run
+        try:
+            return self.runs[int(ref)]
+        except (ValueError, IndexError):
+            raise ValueError(f"No run {ref!r} in {self.path} ({len(self.runs)} runs)") from None
+
+
+def _u_statistic(slower: List[float], faster: List[float]) -> float:
+    # Pairs where the first sample is the larger one, ties counting half
+    u = 0.0
+    for x in slower:
+        for y in faster:
+            if x > y:
+                u += 1
+            elif x == y:
+                u += 0.5
+    return u
+
+
+def _u_distribution(n1: int, n2: int) -> List[int]:
+    # counts[u]: orderings of n1 + n2 distinct values with statistic u
+    counts = [[[1] for _ in range(n2 + 1)] for _ in range(n1 + 1)]
+    for i in range(1, n1 + 1):
+        for j in range(1, n2 + 1):
+            # The largest value comes from the first sample (beating all j
+            # of the second) or from the second
+            with_first = [0] * j + counts[i - 1][j]
+            with_second = counts[i][j - 1]
+            size = max(len(with_first), len(with_second))
+            counts[i][j] = [(with_first[u] if u < len(with_first) else 0)
+                            + (with_second[u] if u < len(with_second) else 0) for u in range(size)]
+    return counts[n1][n2]
+
+
+def mann_whitney_p(slower: List[float], faster: List[float]) -> float:
+    """
+    One-sided p-value of the samples of `slower` not being larger than
+    those of `faster`.
+    """
+    n1, n2 = len(slower), len(faster)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    u = _u_statistic(slower, faster)
+
+    if math.comb(n1 + n2, n1) <= EXACT_U_LIMIT:
+        counts = _u_distribution(n1, n2)
+        return sum(counts[math.floor(u):]) / sum(counts)
+
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (u - 0.5 - mean) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Comparison:
+    key: str
+    base_median: float
+    head_median: float
+    p_value: float
+
+    def __init__(self, key: str, base_median: float, head_median: float, p_value: float) -> None:
+        self.key = key
+        self.base_median = base_median
+        self.head_median = head_median
+        self.p_value = p_value
+
+    def change(self) -> float:
+        return self.head_median / self.base_median - 1
+
+    def regressed(self, threshold: float, alpha: float) -> bool:
+        return self.change() > threshold and self.p_value <= alpha
+
+
+def compare(base: Dict[str, Any], head: Dict[str, Any]) -> List[Comparison]:
+    comparisons = []
+    for key in sorted(set(base["timings"]) & set(head["timings"])):
+        base_timings, head_timings = base["timings"][key], head["timings"][key]
+        comparisons.append(Comparison(key, statistics.median(base_timings), statistics.median(head_timings),
+                                      mann_whitney_p(head_timings, base_timings)))
+    return comparisons
+
+
+def _describe(run: Dict[str, Any]) -> str:
+    name = run["label"] or run["timestamp"]
+    return f"{name} ({run['commit'] or 'unknown commit'}, {len(next(iter(run['timings'].values()), []))} repeats)"
+
+
+def format_comparison(comparisons: List[Comparison], base: Dict[str, Any], head: Dict[str, Any],
+                      threshold: float, alpha: float) -> Tuple[str, int]:
+    """
+    The report and the number of regressions in it.
+    """
+    header = f"{'day/phase':<10} {'base ms':>10} {'head ms':>10} {'change':>8} {'p':>7}"
+    lines = [f"base: {_describe(base)}", f"head: {_describe(head)}", header, "-" * len(header)]
+    regressions = 0
+    for c in comparisons:
+        flag = ""
+        if c.regressed(threshold, alpha):
+            flag = "  SLOWER"
+            regressions += 1
+        lines.append(f"{c.key:<10} {c.base_median * 1e3:>10.2f} {c.head_median * 1e3:>10.2f} "
+                     f"{c.change() * 100:>+7.1f}% {c.p_value:>7.3f}{flag}")
+    lines.append(f"{regressions} regressions (slower by more than {threshold * 100:.0f}% at p <= {alpha})")
+    return "\n".join(lines), regressions
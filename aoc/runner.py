@@ -0,0 +1,181 @@
+import concurrent.futures
+import os
+import time
+import traceback
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from aoc.cache import ResultCache
+from aoc.days import Day
+from aoc.memory import MemoryBudgetExceeded, MemoryStats, MemoryTracking
+from aoc.parsed_cache import ParsedInputCache
+
+
+class JobResult:
+    day: int
+    part: str
+    answer: Any
+    elapsed: float
+    error: Optional[str]
+    cached: bool
+    memory: Optional[MemoryStats]
+
+    def __init__(self, day: int, part: str, answer: Any, elapsed: float, error: Optional[str] = None,
+                 cached: bool = False, memory: Optional[MemoryStats] = None) -> None:
+        self.day = day
+        self.part = part
+        self.answer = answer
+        self.elapsed = elapsed
+        self.error = error
+        self.cached = cached
+        self.memory = memory
+
+    def failed(self) -> bool:
+        return self.error is not None
+
+    def get_str(self) -> str:
+        prefix = f"day {self.day:02d} part {self.part}"
+        timing = f"({self.elapsed * 1e3:.1f} ms{', cached' if self.cached else ''})"
+        if self.failed():
+            return f"{prefix}: FAILED {timing}\n{self.error.rstrip()}"
+
+        answer = str(self.answer)
+        if "\n" in answer:
+            # Answers drawn as ASCII art (day13 part 2) go below the header
+            out = f"{prefix}: {timing}\n{answer}"
+        else:
+            out = f"{prefix}: {answer} {timing}"
+        if self.memory is not None:
+            out += "\n" + self.memory.get_str()
+        return out
+
+
+def run_job(day_number: int, parts: List[str], input_file: str, parsed_cache: Optional[ParsedInputCache] = None,
+            memory: Optional[MemoryTracking] = None) -> List[JobResult]:
+    """
+    Parses the input (or loads it from the parsed input cache) once and
+    solves the parts on it, accounting the memory of every solve if asked
+    to. The prepared input is frozen, so the parts share it; the first
+    part's time includes the parse. Module level, so it can be sent to
+    worker processes.
+    """
+    results = []
+    start = time.perf_counter()
+    try:
+        day = Day(day_number)
+        path = day.input_path(input_file)
+        args = day.parse(path) if parsed_cache is None else parsed_cache.parse(day, path)
+    except Exception:
+        error = traceback.format_exc()
+        return [JobResult(day_number, part, None, time.perf_counter() - start, error) for part in parts]
+
+    for part in parts:
+        memory_stats = None
+        try:
+            if memory is None:
+                answer = day.solve(part, args)
+            else:
+                answer, memory_stats = memory.measure(lambda: day.solve(part, args))
+        except MemoryBudgetExceeded as e:
+            results.append(JobResult(day_number, part, None, time.perf_counter() - start, f"{e}\n"))
+        except Exception:
+            results.append(JobResult(day_number, part, None, time.perf_counter() - start, traceback.format_exc()))
+        else:
+            results.append(JobResult(day_number, part, answer, time.perf_counter() - start, memory=memory_stats))
+        start = time.perf_counter()
+    return results
+
+
+# A day and the parts solved on one parse of its input
+Job = Tuple[int, List[str]]
+
+
+def _jobs(days_parts: List[Tuple[int, str]], split_parts: bool) -> List[Job]:
+    """
+    Groups the (day, part) pairs into jobs, one per day. With split_parts,
+    as when the parsed input cache makes reloading cheap, every part is a
+    job of its own so that the parts of a day run in parallel.
+    """
+    jobs = []
+    for day_number, part in days_parts:
+        if split_parts or len(jobs) == 0 or jobs[-1][0] != day_number:
+            jobs.append((day_number, []))
+        jobs[-1][1].append(part)
+    return jobs
+
+
+def run_sequential(jobs: List[Job], input_file: str, parsed_cache: Optional[ParsedInputCache] = None,
+                   memory: Optional[MemoryTracking] = None) -> Iterator[JobResult]:
+    for day_number, parts in jobs:
+        yield from run_job(day_number, parts, input_file, parsed_cache, memory)
+
+
+def run_parallel(jobs: List[Job], input_file: str, workers: Optional[int] = None,
+                 parsed_cache: Optional[ParsedInputCache] = None,
+                 memory: Optional[MemoryTracking] = None) -> Iterator[JobResult]:
+    """
+    Runs the jobs in a process pool sized to the core count. Results are
+    yielded in submission order regardless of completion order, so the
+    output is deterministic.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, day_number, parts, input_file, parsed_cache, memory)
+                   for day_number, parts in jobs]
+        for future in futures:
+            yield from future.result()
+
+
+def _lookup(cache: ResultCache, day: Day, part: str, input_file: str) -> Tuple[str, Optional[JobResult]]:
+    start = time.perf_counter()
+    key = cache.key(day, part, day.input_path(input_file))
+    answer = cache.get(key)
+    if answer is None:
+        return key, None
+    return key, JobResult(day.number, part, answer, time.perf_counter() - start, cached=True)
+
+
+def run(days: List[Day], input_file: str, variants: bool = False, workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None, parsed_cache: Optional[ParsedInputCache] = None,
+        memory: Optional[MemoryTracking] = None,
+        report: Optional[Callable[[JobResult], None]] = None) -> List[JobResult]:
+    """
+    Cache hits are answered right away; only the misses are executed, and
+    their answers are stored once they come back. Memory accounting needs
+    every job executed, so it is best combined with no cache.
+    """
+    days_by_number = {day.number: day for day in days}
+    jobs = [(day.number, part) for day in days for part in day.parts(variants)]
+
+    keys = {}
+    hits = {}
+    if cache is not None:
+        for day_number, part in jobs:
+            try:
+                keys[day_number, part], hit = _lookup(cache, days_by_number[day_number], part, input_file)
+            except OSError:
+                # E.g. a missing input, which the job itself reports
+                continue
+            if hit is not None:
+                hits[day_number, part] = hit
+
+    misses = _jobs([job for job in jobs if job not in hits], split_parts=parsed_cache is not None)
+    if workers == 1:
+        executed = run_sequential(misses, input_file, parsed_cache, memory)
+    else:
+        executed = run_parallel(misses, input_file, workers, parsed_cache, memory)
+
+    all_results = []
+    for job in jobs:
+        if job in hits:
+            result = hits[job]
+        else:
+            result = next(executed)
+            if cache is not None and job in keys and not result.failed():
+                cache.put(keys[job], result.answer)
+
+        all_results.append(result)
+        if report is not None:
+            report(result)
+    return all_results
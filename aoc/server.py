@@ -0,0 +1,249 @@
+"""
+Warm local solver server.
+
+Keeps every day module imported and the batch solvers' tables precomputed,
+so answering a small input costs the parse and solve alone instead of
+interpreter startup and imports. Clients POST the input bytes to
+/solve/<day>/<part> and get back {"answer": ..., "latency_ms": ...};
+GET /metrics returns the per (day, part) latencies.
+
+The server listens on localhost TCP or on a Unix socket. Connections are
+handled by a fixed pool of worker threads. Solvers hold the GIL, so the
+workers mostly overlap request I/O with solving rather than solving in
+parallel.
+"""
+import collections
+import concurrent.futures
+import http.client
+import http.server
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from aoc.bench import percentile
+from aoc.cache import to_json
+from aoc.days import Day, select_days
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+# Latencies kept per (day, part) for the percentiles
+LATENCY_WINDOW = 1024
+
+
+class LatencyMetrics:
+    latencies: Dict[Tuple[int, str], Deque[float]]
+    counts: Dict[Tuple[int, str], int]
+    errors: Dict[Tuple[int, str], int]
+    lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=LATENCY_WINDOW))
+        self.counts = collections.defaultdict(int)
+        self.errors = collections.defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, day: int, part: str, latency: float, failed: bool) -> None:
+        with self.lock:
+            self.latencies[day, part].append(latency)
+            self.counts[day, part] += 1
+            self.errors[day, part] += failed
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            summary = {}
+            for (day, part), latencies in sorted(self.latencies.items()):
+                summary[f"{day:02d}/{part}"] = {
+                    "requests": self.counts[day, part],
+                    "errors": self.errors[day, part],
+                    "min_ms": min(latencies) * 1e3,
+                    "p50_ms": percentile(list(latencies), 50) * 1e3,
+                    "p95_ms": percentile(list(latencies), 95) * 1e3,
+                    "max_ms": max(latencies) * 1e3,
+                }
+            return summary
+
+
+class Solvers:
+    days: Dict[int, Day]
+    metrics: LatencyMetrics
+
+    def __init__(self) -> None:
+        self.days = {}
+        for day in select_days(None):
+            day.precompute()
+            self.days[day.number] = day
+        self.metrics = LatencyMetrics()
+
+    def has_part(self, day_number: int, part: str) -> bool:
+        return day_number in self.days and part in self.days[day_number].parts(variants=True)
+
+    def solve(self, day_number: int, part: str, data: bytes) -> Any:
+        day = self.days[day_number]
+        start = time.perf_counter()
+        failed = True
+        try:
+            args = day.parse(data)
+            batch_solver = day.batch_solver(part)
+            if batch_solver is not None:
+                # Batch solvers answer from their precomputed tables
+                answer = batch_solver([args])[0]
+            else:
+                answer = day.solve(part, args)
+            failed = False
+            return answer
+        finally:
+            self.metrics.record(day_number, part, time.perf_counter() - start, failed)
+
+
+class RequestHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive, so a client pays the connection setup once
+    protocol_version = "HTTP/1.1"
+    server: 'PooledServerMixin'
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            self._reply(200, self.server.solvers.metrics.summary())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "solve" or not parts[1].isdigit():
+            self._reply(404, {"error": f"expected /solve/<day>/<part>, got {self.path}"})
+            return
+        day_number, part = int(parts[1]), parts[2]
+        if not self.server.solvers.has_part(day_number, part):
+            self._reply(404, {"error": f"unknown day {day_number} part {part}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            answer = self.server.solvers.solve(day_number, part, data)
+        except Exception:
+            self._reply(500, {"error": traceback.format_exc()})
+            return
+        self._reply(200, {"answer": to_json(answer), "latency_ms": (time.perf_counter() - start) * 1e3})
+
+    def log_message(self, format: str, *args) -> None:
+        # Per-request logging would cost more than solving a small input
+        pass
+
+
+class PooledServerMixin:
+    """
+    Hands every connection to a fixed pool of worker threads, instead of
+    the thread per connection of socketserver.ThreadingMixIn.
+    """
+    solvers: Solvers
+    executor: concurrent.futures.ThreadPoolExecutor
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def process_request(self, request, client_address) -> None:
+        self.executor.submit(self._process, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+class TCPSolverServer(PooledServerMixin, http.server.HTTPServer):
+    def __init__(self, address: Tuple[str, int], solvers: Solvers, workers: int) -> None:
+        self.solvers = solvers
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        super().__init__(address, RequestHandler)
+
+
+class UnixSolverServer(PooledServerMixin, socketserver.UnixStreamServer):
+    def __init__(self, path: str, solvers: Solvers, workers: int) -> None:
+        self.solvers = solvers
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        if os.path.exists(path):
+            # Left behind by a server that was killed
+            os.unlink(path)
+        super().__init__(path, RequestHandler)
+
+    def get_request(self):
+        # BaseHTTPRequestHandler expects a (host, port) like client address
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: Optional[str] = None,
+          workers: int = DEFAULT_WORKERS) -> None:
+    solvers = Solvers()
+    if unix_socket is not None:
+        server = UnixSolverServer(unix_socket, solvers, workers)
+    else:
+        server = TCPSolverServer((host, port), solvers, workers)
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.unix_socket = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_socket)
+
+
+class Client:
+    connection: http.client.HTTPConnection
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: Optional[str] = None) -> None:
+        if unix_socket is not None:
+            self.connection = UnixHTTPConnection(unix_socket)
+        else:
+            self.connection = http.client.HTTPConnection(host, port)
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None) -> Dict[str, Any]:
+        self.connection.request(method, path, body)
+        response = self.connection.getresponse()
+        reply = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def solve(self, day: int, part: str, data: bytes) -> Any:
+        return self._request("POST", f"/solve/{day}/{part}", data)["answer"]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return self._request("GET", "/metrics")
+
+    def close(self) -> None:
+        self.connection.close()
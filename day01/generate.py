@@ -0,0 +1,21 @@
+import random
+import sys
+from typing import TextIO
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` sonar depths as a random walk, one per line.
+    """
+    depth = rng.randint(100, 200)
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 20))
+        file_handle.write(f"{depth}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,12 +1,21 @@
 import os
-from typing import List
+import concurrent.futures
+from typing import Iterator, List, Optional, Sequence, Tuple
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Measurements compared per block, so that all window sizes are counted
+# while the block is still in cache
+BLOCK_SIZE = 1 << 16
+
 
 def read_input(path: str) -> List[int]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return list(map(lambda l: int(l[:-1]), file_content))
+    return loader.read_int_lines(path)
 
 
 def solve1(l: List[int]) -> int:
@@ -36,7 +45,134 @@ def solve2(l: List[int]) -> int:
     return cnt
 
 
+"""
+Vectorized: consecutive windows of k measurements share k - 1 of them, so
+the later sum is larger exactly when l[i] > l[i - k]. Part 1 is k = 1 and
+part 2 is k = 3, and any number of window sizes are counted in one pass
+over the array.
+"""
+
+
+def _parse_depths(buf: loader.Buffer, start: int, end: int) -> 'np.ndarray':
+    return loader.parse_int_array(buf[start:end])
+
+
+def _check_windows(windows: Sequence[int]) -> None:
+    for k in windows:
+        if k < 1:
+            raise ValueError(f"window size must be at least 1, got {k}")
+
+
+def count_increases(depths: 'np.ndarray', windows: Sequence[int]) -> List[int]:
+    _check_windows(windows)
+
+    counts = [0] * len(windows)
+    for block_start in range(0, len(depths), BLOCK_SIZE):
+        block_end = min(len(depths), block_start + BLOCK_SIZE)
+        for j, k in enumerate(windows):
+            start = max(block_start, k)
+            if start < block_end:
+                counts[j] += int(np.count_nonzero(depths[start:block_end] > depths[start - k:block_end - k]))
+    return counts
+
+
+"""
+Parallel: the mapped input is split into chunks on line boundaries and each
+worker counts the increases within its chunk. The first k measurements of a
+chunk compare against the previous chunks, so workers also return their
+first and last max(k) measurements and the boundaries are counted here, in
+order. A chunk shorter than max(k) only extends the tail carried over.
+"""
+
+
+def _count_chunk(path: str, start: int, end: int,
+                 windows: Sequence[int]) -> Tuple[List[int], 'np.ndarray', 'np.ndarray']:
+    overlap = max(windows)
+    with loader.mapped(path) as buf:
+        depths = _parse_depths(buf, start, end)
+    return count_increases(depths, windows), depths[:overlap].copy(), depths[-overlap:].copy()
+
+
+def _combine_chunks(chunk_results: Iterator[Tuple[List[int], 'np.ndarray', 'np.ndarray']],
+                    windows: Sequence[int]) -> List[int]:
+    overlap = max(windows)
+    counts = [0] * len(windows)
+    tail = np.zeros(0, dtype=np.int64)
+    for chunk_counts, head, chunk_tail in chunk_results:
+        boundary = np.concatenate([tail, head])
+        for j, k in enumerate(windows):
+            counts[j] += chunk_counts[j]
+            # The chunk's measurements i < k against the ones before it
+            start = max(len(tail), k)
+            end = min(len(boundary), len(tail) + k)
+            if start < end:
+                counts[j] += int(np.count_nonzero(boundary[start:end] > boundary[start - k:end - k]))
+        tail = np.concatenate([tail, chunk_tail])[-overlap:]
+    return counts
+
+
+def count_increases_parallel(path: str, windows: Sequence[int], workers: Optional[int] = None,
+                             chunk_size: int = loader.CHUNK_SIZE) -> List[int]:
+    _check_windows(windows)
+    if len(windows) == 0:
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with loader.mapped(path) as buf:
+        bounds = list(loader.chunk_bounds(buf, chunk_size))
+
+    args = ([path] * len(bounds), [start for start, _ in bounds], [end for _, end in bounds],
+            [windows] * len(bounds))
+    if workers == 1:
+        return _combine_chunks(map(_count_chunk, *args), windows)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return _combine_chunks(executor.map(_count_chunk, *args), windows)
+
+
+def solve1_v2(l: List[int]) -> int:
+    return count_increases(np.asarray(l, dtype=np.int64), [1])[0]
+
+
+def solve2_v2(l: List[int]) -> int:
+    return count_increases(np.asarray(l, dtype=np.int64), [3])[0]
+
+
+"""
+Streaming: both parts compare a measurement with one seen 1 or 3 lines
+earlier (the windows share their middle values), so the last three
+measurements are all that is kept.
+"""
+
+
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    cnt1 = 0
+    cnt2 = 0
+    last = []
+
+    for line in lines:
+        if line == "":
+            continue
+        x = int(line)
+        if len(last) >= 1 and x > last[-1]:
+            cnt1 += 1
+        if len(last) == 3:
+            if x > last[0]:
+                cnt2 += 1
+            last.pop(0)
+        last.append(x)
+
+    return cnt1, cnt2
+
+
 if __name__ == "__main__":
-    l = read_input(sys.argv[1])
-    print(solve1(l))
-    print(solve2(l))
+    if len(sys.argv) > 2:
+        # Window sizes given: count them all on the vectorized path, one
+        # worker process per core
+        windows = [int(k) for k in sys.argv[2:]]
+        for count in count_increases_parallel(sys.argv[1], windows):
+            print(count)
+    else:
+        l = read_input(sys.argv[1])
+        print(solve1(l))
+        print(solve2(l))
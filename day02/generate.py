@@ -0,0 +1,30 @@
+import random
+import sys
+from typing import TextIO
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` submarine commands. "up" is only emitted while it keeps the
+    part 1 depth non-negative.
+    """
+    depth = 0
+    for _ in range(size):
+        amount = rng.randint(1, 9)
+        choice = rng.random()
+        if choice < 0.4:
+            file_handle.write(f"forward {amount}\n")
+        elif choice < 0.7 or depth < amount:
+            depth += amount
+            file_handle.write(f"down {amount}\n")
+        else:
+            depth -= amount
+            file_handle.write(f"up {amount}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
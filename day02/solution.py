@@ -1,6 +1,13 @@
 import os
 import sys
-from typing import List, Tuple
+import concurrent.futures
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 class CommandTypes:
@@ -39,32 +46,202 @@ class Command:
         return hor_pos, depth, aim
 
 
-def read_input(path: str) -> List[Command]:
-    with open(path, "r") as file_handle:
-        file_content = map(lambda l: l[:-1].split(), file_handle.readlines())
-    return list(map(lambda l: Command(l[0], int(l[1])), file_content))
+def _parse_commands(lines: Iterator[str]) -> Iterator[Command]:
+    file_content = map(lambda l: l.split(), lines)
+    return map(lambda l: Command(l[0], int(l[1])), file_content)
 
 
-def solve1(cmds: List[Command]) -> int:
-    hor_pos, depth = 0, 0
+"""
+Array representation: the opcode of every command in one small int array
+and the amounts in another, instead of one Command per line. Part 1 is
+masked sums of the amounts. In part 2 the aim at each command is the
+cumulative sum of the signed up/down amounts, and the depth the sum of aim
+times amount over the forward commands (see Transform.of_arrays).
+"""
 
-    for cmd in cmds:
-        hor_pos, depth = cmd.apply(hor_pos, depth)
 
-    return hor_pos * depth
+class Opcodes:
+    FORWARD = 0
+    DOWN = 1
+    UP = 2
+
+
+class CommandArrays:
+    opcodes: 'np.ndarray'
+    amounts: 'np.ndarray'
+
+    def __init__(self, opcodes: 'np.ndarray', amounts: 'np.ndarray') -> None:
+        assert len(opcodes) == len(amounts)
+        self.opcodes = opcodes
+        self.amounts = amounts
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+
+def _opcode_table() -> 'np.ndarray':
+    # The opcode of a command by the first letter of its name
+    table = np.full(256, -1, dtype=np.int8)
+    table[ord(CommandTypes.FORWARD[0])] = Opcodes.FORWARD
+    table[ord(CommandTypes.DOWN[0])] = Opcodes.DOWN
+    table[ord(CommandTypes.UP[0])] = Opcodes.UP
+    return table
+
+
+def _parse_command_arrays(buf: loader.Buffer, start: int, end: int) -> CommandArrays:
+    chunk = buf[start:end]
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    newline = ord(loader.NEWLINE)
+    line_starts = np.concatenate([[0], np.flatnonzero(data[:-1] == newline) + 1])
+    # Blank lines have no command
+    line_starts = line_starts[data[line_starts] != newline]
+    opcodes = _opcode_table()[data[line_starts]]
+    assert np.all(opcodes >= 0)
 
+    # With the command names deleted only the amounts are left
+    names = (CommandTypes.FORWARD + CommandTypes.DOWN + CommandTypes.UP).encode()
+    amounts = loader.parse_int_array(chunk.translate(None, names))
+    return CommandArrays(opcodes, amounts)
 
-def solve2(cmds: List[Command]) -> int:
-    hor_pos, depth, aim = 0, 0, 0
 
-    for cmd in cmds:
-        hor_pos, depth, aim = cmd.apply2(hor_pos, depth, aim)
+def read_input(path: loader.Source) -> CommandArrays:
+    chunks = []
+    with loader.mapped(path) as buf:
+        for start, end in loader.chunk_bounds(buf):
+            chunks.append(_parse_command_arrays(buf, start, end))
+    if len(chunks) == 0:
+        # Nothing to parse (an empty input)
+        return CommandArrays(np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64))
+    return CommandArrays(np.concatenate([c.opcodes for c in chunks]), np.concatenate([c.amounts for c in chunks]))
 
+
+def pack_input(commands: CommandArrays) -> 'Dict[str, np.ndarray]':
+    return {"opcodes": commands.opcodes, "amounts": commands.amounts}
+
+
+def unpack_input(arrays: 'Dict[str, np.ndarray]') -> CommandArrays:
+    return CommandArrays(arrays["opcodes"], arrays["amounts"])
+
+
+def _signed_aim_changes(commands: CommandArrays) -> 'np.ndarray':
+    # down adds to the aim (the part 1 depth), up subtracts, forward keeps it
+    signs = np.zeros(3, dtype=np.int64)
+    signs[Opcodes.DOWN] = 1
+    signs[Opcodes.UP] = -1
+    return signs[commands.opcodes] * commands.amounts
+
+
+def solve1(commands: CommandArrays) -> int:
+    forward = commands.opcodes == Opcodes.FORWARD
+    hor_pos = int(commands.amounts[forward].sum())
+    depth = int(_signed_aim_changes(commands).sum())
     return hor_pos * depth
 
 
+def solve2(commands: CommandArrays) -> int:
+    _, answer = Transform.of_arrays(commands).answers()
+    return answer
+
+
+"""
+Transforms: applying a run of commands (part 2 semantics) to a state
+(hor_pos, depth, aim) adds fixed amounts to hor_pos and aim, and to the
+depth a fixed amount plus the starting aim times the forward distance:
+
+    (h, d, a) -> (h + H, d + D + a * H, a + A)
+
+So every run of commands is summarized by (H, D, A), and two runs compose
+into one, associatively, with the identity (0, 0, 0) as the empty run.
+Chunks of a log are summarized independently (in worker processes) and
+combined in order, and a command is appended to a summary in constant time.
+The part 1 depth is the part 2 aim, so a summary answers both parts.
+"""
+
+
+class Transform:
+    hor_pos: int
+    depth: int
+    aim: int
+
+    def __init__(self, hor_pos: int = 0, depth: int = 0, aim: int = 0) -> None:
+        self.hor_pos = hor_pos
+        self.depth = depth
+        self.aim = aim
+
+    @staticmethod
+    def of_command(cmd: Command) -> 'Transform':
+        return Transform(*cmd.apply2(0, 0, 0))
+
+    @staticmethod
+    def of_arrays(commands: CommandArrays) -> 'Transform':
+        forward = commands.opcodes == Opcodes.FORWARD
+        aim_changes = _signed_aim_changes(commands)
+        aim = np.cumsum(aim_changes)
+        return Transform(int(commands.amounts[forward].sum()),
+                         int((aim[forward] * commands.amounts[forward]).sum()),
+                         int(aim_changes.sum()))
+
+    def then(self, other: 'Transform') -> 'Transform':
+        # This run of commands followed by the other
+        return Transform(self.hor_pos + other.hor_pos,
+                         self.depth + other.depth + self.aim * other.hor_pos,
+                         self.aim + other.aim)
+
+    def append(self, cmd: Command) -> 'Transform':
+        return self.then(Transform.of_command(cmd))
+
+    def apply(self, hor_pos: int, depth: int, aim: int) -> Tuple[int, int, int]:
+        return hor_pos + self.hor_pos, depth + self.depth + aim * self.hor_pos, aim + self.aim
+
+    def answers(self) -> Tuple[int, int]:
+        # Both parts, starting from (0, 0, 0)
+        return self.hor_pos * self.aim, self.hor_pos * self.depth
+
+
+def combine(transforms: Iterable[Transform]) -> Transform:
+    combined = Transform()
+    for transform in transforms:
+        combined = combined.then(transform)
+    return combined
+
+
+def _summarize_chunk(path: str, start: int, end: int) -> Transform:
+    with loader.mapped(path) as buf:
+        return Transform.of_arrays(_parse_command_arrays(buf, start, end))
+
+
+def summarize_parallel(path: str, workers: Optional[int] = None, chunk_size: int = loader.CHUNK_SIZE) -> Transform:
+    """
+    The transform of a whole command log, its chunks summarized in a
+    process pool (in-process with a single worker).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with loader.mapped(path) as buf:
+        bounds = list(loader.chunk_bounds(buf, chunk_size))
+
+    args = ([path] * len(bounds), [start for start, _ in bounds], [end for _, end in bounds])
+    if workers == 1:
+        return combine(map(_summarize_chunk, *args))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return combine(executor.map(_summarize_chunk, *args))
+
+
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    summary = Transform()
+    for cmd in _parse_commands(line for line in lines if line != ""):
+        summary = summary.append(cmd)
+    return summary.answers()
+
+
 if __name__ == "__main__":
     file_path = sys.argv[1]
-    l = read_input(file_path)
-    print(solve1(l))
-    print(solve2(l))
+    if len(sys.argv) > 2:
+        # Number of worker processes given: summarize the chunks in parallel
+        for answer in summarize_parallel(file_path, int(sys.argv[2])).answers():
+            print(answer)
+    else:
+        l = read_input(file_path)
+        print(solve1(l))
+        print(solve2(l))
@@ -0,0 +1,68 @@
+import random
+import sys
+from typing import List, TextIO
+
+
+MIN_BIT_LENGTH = 12
+
+
+def _numbers(size: int, bit_length: int, rng: random.Random) -> List[int]:
+    """
+    Draws `size` distinct numbers such that every group of numbers sharing a
+    prefix (with at least two members) has both ones and zeros in the next
+    bit. Otherwise the CO2 rating search could filter all numbers away.
+    """
+    nums = []
+
+    stack = [(0, 0, size)]
+    while len(stack) > 0:
+        prefix, depth, n = stack.pop()
+        remaining = bit_length - depth
+
+        if n == 1:
+            nums.append((prefix << remaining) | rng.getrandbits(remaining))
+            continue
+
+        capacity = 1 << (remaining - 1)
+        lo, hi = max(1, n - capacity), min(n - 1, capacity)
+        ones = min(hi, max(lo, int(n * rng.uniform(0.3, 0.7))))
+        if depth == 0 and 2 * ones == n and lo < hi:
+            # The first column is decided here, so avoid a tie right away
+            ones = ones + 1 if ones < hi else ones - 1
+
+        stack.append(((prefix << 1) | 1, depth + 1, ones))
+        stack.append((prefix << 1, depth + 1, n - ones))
+
+    rng.shuffle(nums)
+    return nums
+
+
+def _has_tied_column(nums: List[int], bit_length: int) -> bool:
+    for bit in range(bit_length):
+        ones = sum((num >> bit) & 1 for num in nums)
+        if 2 * ones == len(nums):
+            return True
+    return False
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` (at least 3) diagnostic numbers. No column may have as many
+    ones as zeros for the gamma rate to be defined, so tied draws are retried.
+    """
+    bit_length = max(MIN_BIT_LENGTH, size.bit_length() + 1)
+
+    nums = _numbers(size, bit_length, rng)
+    while _has_tied_column(nums, bit_length):
+        nums = _numbers(size, bit_length, rng)
+
+    for num in nums:
+        file_handle.write(f"{num:0{bit_length}b}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
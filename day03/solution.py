@@ -1,91 +1,286 @@
+import bisect
+import collections
+import collections.abc
 import os
 import sys
-from typing import List, Tuple, Callable
-import copy
+from typing import Dict, Iterator, List, Sequence, Tuple, Callable
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
 
-def read_input(path: str) -> List[List[bool]]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return list(map(lambda l:list( map(lambda bit: bit == '1', l[:-1])), file_content))
+np = lazy_import("numpy")
 
+MAX_BIT_LENGTH = 64
+# Numbers whose bits are unpacked at once when counting columns
+COUNT_BLOCK_SIZE = 1 << 16
 
-def _calculate_bit_distributions(l: List[List[bool]]) -> Tuple[List[int], List[int]]:
-    bit_length = len(l[0])
 
-    one_counts = [0 for _ in range(bit_length)]
-    zero_counts = [0 for _ in range(bit_length)]
+class Report:
+    """
+    The diagnostic report, one number per line packed into a uint64 (bit i
+    of the line, counted from the left, is bit bit_length - 1 - i).
+    """
+    values: 'np.ndarray'
+    bit_length: int
 
-    for num in l:
-        for i in range(bit_length):
-            if num[i]:
-                one_counts[i] += 1
-            else:
-                zero_counts[i] += 1
+    def __init__(self, values: 'np.ndarray', bit_length: int) -> None:
+        assert bit_length <= MAX_BIT_LENGTH
+        self.values = values
+        self.bit_length = bit_length
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _pack_lines(chunk: bytes, bit_length: int) -> 'np.ndarray':
+    # Every line is bit_length digits and a line break
+    if not chunk.endswith(loader.NEWLINE):
+        chunk += loader.NEWLINE
+    lines = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, bit_length + 1)
+    bits = lines[:, :bit_length] == ord('1')
+
+    # packbits aligns the bits to the left of whole bytes, which are then
+    # right-aligned into 8 bytes and read as big-endian integers
+    packed = np.packbits(bits, axis=1)
+    padded = np.zeros((len(lines), 8), dtype=np.uint8)
+    padded[:, 8 - packed.shape[1]:] = packed
+    return padded.view(">u8").ravel().astype(np.uint64) >> np.uint64(8 * packed.shape[1] - bit_length)
+
+
+def read_input(path: loader.Source) -> Report:
+    with loader.mapped(path) as buf:
+        bit_length = buf.find(loader.NEWLINE)
+        if bit_length == -1:
+            bit_length = len(buf)
+        chunks = [_pack_lines(buf[start:end], bit_length) for start, end in loader.chunk_bounds(buf)]
+    values = np.concatenate(chunks) if len(chunks) > 0 else np.zeros(0, dtype=np.uint64)
+    return Report(values, bit_length)
+
+
+def pack_input(report: Report) -> 'Dict[str, np.ndarray]':
+    return {"values": report.values, "bit_length": np.array([report.bit_length])}
+
+
+def unpack_input(arrays: 'Dict[str, np.ndarray]') -> Report:
+    return Report(arrays["values"], int(arrays["bit_length"][0]))
+
+
+def _calculate_bit_distributions(values: 'np.ndarray', bit_length: int) -> Tuple[List[int], List[int]]:
+    # Unpacking the 8 big-endian bytes of each number gives its 64 bits from
+    # the most significant one, the last bit_length of which are the columns
+    one_counts = np.zeros(MAX_BIT_LENGTH, dtype=np.int64)
+    for start in range(0, len(values), COUNT_BLOCK_SIZE):
+        block = values[start:start + COUNT_BLOCK_SIZE].astype(">u8").view(np.uint8).reshape(-1, 8)
+        one_counts += np.unpackbits(block, axis=1).sum(axis=0, dtype=np.int64)
 
+    one_counts = one_counts[MAX_BIT_LENGTH - bit_length:].tolist()
+    zero_counts = [len(values) - ones for ones in one_counts]
     return one_counts, zero_counts
 
 
-def solve1(l: List[List[bool]]):
-    one_counts, zero_counts = _calculate_bit_distributions(l)
+def solve1(report: Report):
+    one_counts, zero_counts = _calculate_bit_distributions(report.values, report.bit_length)
 
     # Construct gamma and epsilon rate
     gamma_rate = 0
-    epsilon_rate = 0
-
-    bit_length = len(l[0])
-    for i in range(bit_length):
+    for i in range(report.bit_length):
         assert one_counts[i] != zero_counts[i]
-        if one_counts[i] > zero_counts[i]:
-            gamma_rate = (gamma_rate << 1) | 1
-            epsilon_rate <<= 1
-        else:
-            gamma_rate <<= 1
-            epsilon_rate = (epsilon_rate << 1) | 1
+        gamma_rate = (gamma_rate << 1) | (one_counts[i] > zero_counts[i])
+    epsilon_rate = gamma_rate ^ ((1 << report.bit_length) - 1)
 
     return gamma_rate * epsilon_rate
 
 
-def search(l: List[List[bool]], bit_criteria: Callable) -> List[bool]:
-    bit_length = len(l[0])
+"""
+Rating index: sorted, the numbers sharing a prefix are a contiguous range,
+so the sorted array is a binary trie whose nodes are index ranges. Where a
+node splits on its next bit is a binary search, and the ones and zeros
+below the node are the sizes of the two halves. A rating is then a single
+walk down from the root, taking the child the bit criteria picks.
+"""
+
+
+class ColumnCounts(collections.abc.Sequence):
+    """
+    The counts of ones (or zeros) per column among the remaining numbers, as
+    the bit criteria receive them. The column being filtered is known from
+    the search; the others are only counted when a criterion reads them.
+    """
+    count_ones: Callable[[int], int]
+    total: int
+    bit_length: int
+    # The column being filtered and its count of ones
+    known: Tuple[int, int]
+    zeros: bool
+
+    def __init__(self, count_ones: Callable[[int], int], total: int, bit_length: int, known: Tuple[int, int],
+                 zeros: bool = False) -> None:
+        self.count_ones = count_ones
+        self.total = total
+        self.bit_length = bit_length
+        self.known = known
+        self.zeros = zeros
+
+    def __len__(self) -> int:
+        return self.bit_length
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return [self[k] for k in range(*j.indices(self.bit_length))]
+        if j < 0:
+            j += self.bit_length
+        if not 0 <= j < self.bit_length:
+            raise IndexError("column out of range")
+
+        ones = self.known[1] if j == self.known[0] else self.count_ones(j)
+        return self.total - ones if self.zeros else ones
+
+
+# bit_criteria(i, one_counts, zero_counts): whether to keep the numbers with
+# a one in column i
+BitCriteria = Callable[[int, Sequence[int], Sequence[int]], bool]
+
+
+def _column_counts(count_ones: Callable[[int], int], total: int, bit_length: int,
+                   i: int, ones: int) -> Tuple[ColumnCounts, ColumnCounts]:
+    return (ColumnCounts(count_ones, total, bit_length, (i, ones)),
+            ColumnCounts(count_ones, total, bit_length, (i, ones), zeros=True))
 
+
+class RatingIndex:
+    values: 'np.ndarray'
+    bit_length: int
+
+    def __init__(self, report: Report) -> None:
+        self.values = np.sort(report.values)
+        self.bit_length = report.bit_length
+
+    def search(self, bit_criteria: BitCriteria) -> int:
+        """
+        The one number left by filtering column by column on
+        bit_criteria(i, one_counts, zero_counts), given the per-column
+        counts among the remaining numbers.
+        """
+        lo, hi = 0, len(self.values)
+        # The numbers in values[lo:hi] all start with prefix
+        prefix = 0
+        for i in range(self.bit_length):
+            if hi - lo == 1:
+                break
+
+            shift = self.bit_length - 1 - i
+            first_one = (prefix << 1 | 1) << shift
+            mid = lo + int(np.searchsorted(self.values[lo:hi], np.uint64(first_one)))
+
+            remaining = self.values[lo:hi]
+            count_ones = lambda j: int(np.count_nonzero(
+                (remaining >> np.uint64(self.bit_length - 1 - j)) & np.uint64(1)))
+            keep_bit = bit_criteria(i, *_column_counts(count_ones, hi - lo, self.bit_length, i, hi - mid))
+            if keep_bit:
+                lo = mid
+            else:
+                hi = mid
+            prefix = prefix << 1 | keep_bit
+
+        assert hi - lo == 1
+        return int(self.values[lo])
+
+
+def search(report: Report, bit_criteria: BitCriteria) -> int:
+    return RatingIndex(report).search(bit_criteria)
+
+
+def bit_criteria_oxygen(i: int, one_counts: Sequence[int], zero_counts: Sequence[int]) -> bool:
+    return one_counts[i] >= zero_counts[i]
+
+
+def bit_criteria_co2(i: int, one_counts: Sequence[int], zero_counts: Sequence[int]) -> bool:
+    return one_counts[i] < zero_counts[i]
+
+
+def solve2(report: Report):
+    index = RatingIndex(report)
+    oxygen_gen_rating = index.search(bit_criteria_oxygen)
+    co2_scrubber_rating = index.search(bit_criteria_co2)
+
+    return oxygen_gen_rating * co2_scrubber_rating
+
+
+"""
+Streaming: part 1 only needs a count of ones per column. For part 2, how
+often each distinct number occurs is kept, which is bounded by 2^bit_length
+however many lines there are, and by the number of lines however wide they
+are. Sorted, the distinct numbers sharing a prefix are a contiguous range
+of them, so the rating searches narrow down a range bit by bit as
+RatingIndex does.
+"""
+
+
+def _search_counts(values: List[int], prefix_counts: List[int], bit_length: int,
+                   bit_criteria: BitCriteria) -> int:
+    # values: the distinct numbers, sorted; prefix_counts[j]: how many
+    # numbers are below values[j]
+    lo, hi = 0, len(values)
+    prefix = 0
     for i in range(bit_length):
-        if len(l) == 1:
+        if prefix_counts[hi] - prefix_counts[lo] == 1:
             break
 
-        one_counts, zero_counts = _calculate_bit_distributions(l)
+        shift = bit_length - 1 - i
+        mid = bisect.bisect_left(values, (prefix << 1 | 1) << shift, lo, hi)
+        count_ones = lambda j: sum(prefix_counts[k + 1] - prefix_counts[k] for k in range(lo, hi)
+                                   if values[k] >> (bit_length - 1 - j) & 1)
+        keep_bit = bit_criteria(i, *_column_counts(count_ones, prefix_counts[hi] - prefix_counts[lo], bit_length,
+                                                   i, prefix_counts[hi] - prefix_counts[mid]))
+        if keep_bit:
+            lo = mid
+        else:
+            hi = mid
+        prefix = prefix << 1 | keep_bit
 
-        keep_bit = bit_criteria(i, one_counts, zero_counts)
-        l = list(filter(lambda num: num[i] == keep_bit, l))
+    assert prefix_counts[hi] - prefix_counts[lo] == 1
+    return values[lo]
 
-    assert len(l) == 1
-    target_num = l[0]
 
-    out_num = 0
-    for i in range(bit_length):
-        out_num <<= 1
-        if target_num[i]:
-            out_num |= 1
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    one_counts = []
+    counts = collections.Counter()
+    bit_length = 0
 
-    return out_num
+    for line in lines:
+        if line == "":
+            continue
+        if bit_length == 0:
+            bit_length = len(line)
+            one_counts = [0 for _ in range(bit_length)]
+        for i, c in enumerate(line):
+            one_counts[i] += c == "1"
+        counts[int(line, 2)] += 1
 
+    if bit_length == 0:
+        return 0, 0
+    total = sum(counts.values())
 
-def solve2(l: List[List[bool]]):
-    # Search for the oxygen generator rating
-    def bit_criteria_oxygen(i: int, one_counts: List[int], zero_counts: List[int]) -> bool:
-        return one_counts[i] >= zero_counts[i]
-    oxygen_gen_rating = search(copy.deepcopy(l), bit_criteria_oxygen)
+    gamma_rate = 0
+    for ones in one_counts:
+        zeros = total - ones
+        assert ones != zeros
+        gamma_rate = (gamma_rate << 1) | (ones > zeros)
+    epsilon_rate = gamma_rate ^ ((1 << bit_length) - 1)
 
-    # Search for the CO2 scrubber rating
-    def bit_criteria_co2(i: int, one_counts: List[int], zero_counts: List[int]) -> bool:
-        return one_counts[i] < zero_counts[i]
-    co2_scrubber_rating = search(copy.deepcopy(l), bit_criteria_co2)
+    values = sorted(counts)
+    prefix_counts = [0]
+    for v in values:
+        prefix_counts.append(prefix_counts[-1] + counts[v])
+    oxygen_gen_rating = _search_counts(values, prefix_counts, bit_length, bit_criteria_oxygen)
+    co2_scrubber_rating = _search_counts(values, prefix_counts, bit_length, bit_criteria_co2)
 
-    return oxygen_gen_rating * co2_scrubber_rating
+    return gamma_rate * epsilon_rate, oxygen_gen_rating * co2_scrubber_rating
 
 
 if __name__ == "__main__":
     input_path = sys.argv[1]
-    l = read_input(input_path)
-    print(solve1(l))
-    print(solve2(l))
+    report = read_input(input_path)
+    print(solve1(report))
+    print(solve2(report))
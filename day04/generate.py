@@ -0,0 +1,31 @@
+import random
+import sys
+from typing import TextIO
+
+
+BOARD_SIDE_LENGTH = 5
+MAX_NUM = 100
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes the draw order followed by `size` bingo boards. Every number is
+    drawn, so each board wins eventually.
+    """
+    draws = list(range(MAX_NUM))
+    rng.shuffle(draws)
+    file_handle.write(",".join(map(str, draws)) + "\n")
+
+    for _ in range(size):
+        board = rng.sample(range(MAX_NUM), BOARD_SIDE_LENGTH * BOARD_SIDE_LENGTH)
+        file_handle.write("\n")
+        for i in range(0, len(board), BOARD_SIDE_LENGTH):
+            file_handle.write(" ".join(f"{num:2d}" for num in board[i:i + BOARD_SIDE_LENGTH]) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,84 +1,215 @@
 import os 
 import sys
-from typing import List, Tuple
+import array
+from typing import Dict, List, Optional, Tuple
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
 
-# We have 5x5 boards
-BOARD_SIDE_LENGTH = 5
+np = lazy_import("numpy")
 
 
 class BingoBoard:
-    nums: dict
-    row_hits: List[int]
-    col_hits: List[int]
+    """
+    A side x side board that is never changed by playing it: which cells are
+    marked is a bitmask (bit i * side + j for cell (i, j)) held by the
+    caller, so the same board replays any number of draw sequences.
+    """
+    __slots__ = ("side", "cells", "positions", "line_masks")
+
+    side: int
+    cells: array.array
+    # Cell of every number on the board
+    positions: Dict[int, int]
+    # Per cell, the masks of its row and its column
+    line_masks: List[Tuple[int, int]]
 
     def __init__(self, board: List[List[int]]) -> None:
-        assert BOARD_SIDE_LENGTH == len(board) and BOARD_SIDE_LENGTH == len(board[0])
-        
-        self.nums = {}
-        for i in range(BOARD_SIDE_LENGTH):
-            for j in range(BOARD_SIDE_LENGTH):
-                self.nums[board[i][j]] = (i, j)
-
-        self.row_hits = [0 for _ in range(BOARD_SIDE_LENGTH)]
-        self.col_hits = [0 for _ in range(BOARD_SIDE_LENGTH)]
-
-    def mark(self, num: int) -> bool:
-        if num in self.nums and self.nums[num] is not None:
-            i, j = self.nums[num]
-            self.row_hits[i] += 1
-            self.col_hits[j] += 1
-            self.nums[num] = None
-
-            return self.row_hits[i] == BOARD_SIDE_LENGTH or self.col_hits[j] == BOARD_SIDE_LENGTH
-        
-        return False
-
-    def get_score(self, last_num: int) -> int:
-        unmarked_sum = 0
-        for num in self.nums:
-            if self.nums[num] is not None:
-                unmarked_sum += num
-
+        self.side = len(board)
+        assert all(len(row) == self.side for row in board)
+
+        self.cells = array.array("q", [num for row in board for num in row])
+        self.positions = {num: cell for cell, num in enumerate(self.cells)}
+
+        row_mask = (1 << self.side) - 1
+        col_mask = sum(1 << (i * self.side) for i in range(self.side))
+        self.line_masks = [(row_mask << (i * self.side), col_mask << j)
+                           for i in range(self.side) for j in range(self.side)]
+
+    def mark(self, marked: int, num: int) -> Tuple[int, bool]:
+        """
+        The marks after drawing num, and whether that completed a line.
+        """
+        cell = self.positions.get(num)
+        if cell is None or marked >> cell & 1:
+            return marked, False
+
+        marked |= 1 << cell
+        row_mask, col_mask = self.line_masks[cell]
+        return marked, (marked & row_mask) == row_mask or (marked & col_mask) == col_mask
+
+    def get_score(self, marked: int, last_num: int) -> int:
+        unmarked_sum = sum(num for cell, num in enumerate(self.cells) if not marked >> cell & 1)
         return unmarked_sum * last_num
 
-
-def read_input(path: str) -> Tuple[List[BingoBoard], List[int]]:
-    with open(path, "r") as file_handle:
+    def play(self, nums: List[int]) -> Optional[Tuple[int, int]]:
+        # The index of the winning draw and the score, or None if it never wins
+        marked = 0
+        for i, num in enumerate(nums):
+            marked, won = self.mark(marked, num)
+            if won:
+                return i, self.get_score(marked, num)
+        return None
+
+
+def _board_side(buf: loader.Buffer, start: int) -> int:
+    # The number of integers on the first board line
+    for line in loader.lines(buf, start):
+        nums = line.tobytes().split()
+        if len(nums) > 0:
+            return len(nums)
+    return 1
+
+
+def read_input(path: loader.Source) -> Tuple['np.ndarray', List[int]]:
+    """
+    The boards stacked into a (K, side, side) array, and the drawn numbers.
+    """
+    with loader.mapped(path) as buf:
         # Parse random numbers
-        nums = file_handle.readline()
-        nums = list(map(int, nums[:-1].split(',')))
+        first_line_end = buf.find(b'\n')
+        nums = loader.parse_ints(buf, 0, first_line_end)
+
+        # Parse boards, whitespace separated however the lines are broken
+        side = _board_side(buf, first_line_end + 1)
+        chunks = [loader.parse_int_array(buf[start:end])
+                  for start, end in loader.chunk_bounds(buf, start=first_line_end)]
+
+    board_nums = np.concatenate(chunks) if len(chunks) > 0 else np.zeros(0, dtype=np.int64)
+    assert len(board_nums) % (side * side) == 0
+    return board_nums.reshape(-1, side, side), nums
+
+
+def pack_input(boards: 'np.ndarray', nums: List[int]) -> 'Dict[str, np.ndarray]':
+    return {"boards": boards, "nums": np.array(nums, dtype=np.int64)}
+
+
+def unpack_input(arrays: 'Dict[str, np.ndarray]') -> Tuple['np.ndarray', List[int]]:
+    return arrays["boards"], arrays["nums"].tolist()
+
+
+"""
+Win times: with every number replaced by the index of the draw that marks
+it, a line is complete at the latest draw time in it and a board wins at
+the earliest of its lines. All boards are resolved at once, the first
+winner being the argmin of the win times and the last winner the argmax.
+Boards winning at the same draw are ordered as the simulation marks them,
+board by board.
+"""
+
+
+# Numbers spanning at most this many table entries per board cell are
+# looked up in a dense table, wider ranges in the sorted drawn numbers
+DENSE_RANGE_FACTOR = 4
+
+
+def _draw_times(boards: 'np.ndarray', nums: List[int]) -> 'np.ndarray':
+    # Numbers never drawn get len(nums), after every draw
+    # The smallest type holding the draw indices, as the times of all boards
+    # are scanned several times
+    dtype = np.min_scalar_type(len(nums))
+    if len(nums) == 0 or boards.size == 0:
+        return np.full(boards.shape, len(nums), dtype=dtype)
+
+    values = np.array(nums, dtype=np.int64)
+    lo = min(int(values.min()), int(boards.min()))
+    hi = max(int(values.max()), int(boards.max()))
+    if hi - lo < DENSE_RANGE_FACTOR * (boards.size + len(nums)):
+        times = np.full(hi - lo + 1, len(nums), dtype=dtype)
+        # Assigned back to front, so a number drawn twice keeps its first draw
+        times[values[::-1] - lo] = np.arange(len(nums) - 1, -1, -1)
+        return np.take(times, boards - lo)
 
-        file_handle.readline()  # Empty line
+    # The distinct drawn numbers, sorted, with the index of their first draw
+    drawn, first_draws = np.unique(values, return_index=True)
+    positions = np.minimum(np.searchsorted(drawn, boards), len(drawn) - 1)
+    return np.where(drawn[positions] == boards, first_draws[positions], len(nums)).astype(dtype)
 
-        # Parse boards
-        boards = []
 
-        line = file_handle.readline()
-        while len(line) > 0 and line != '\n':
-            curr_board = []
-            for _ in range(BOARD_SIDE_LENGTH):
-                line = line[:-1] if line.endswith('\n') else line
-                line = list(map(int, line.split()))
-                curr_board.append(line)
-                line = file_handle.readline()
-            
-            boards.append(BingoBoard(curr_board))
-            
-            line = file_handle.readline() # Skipy empty line
+def win_times(boards: 'np.ndarray', nums: List[int]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    The draw index at which every board wins (len(nums) if it never does),
+    and the draw times of its numbers.
+    """
+    times = _draw_times(boards, nums)
+    side = boards.shape[1]
+    if len(boards) == 0:
+        return np.zeros(0, dtype=times.dtype), times
 
-    return boards, nums
+    # Reducing over the short board axes is slow, so the maxima and minima
+    # are taken across whole (K, side) slices instead
+    row_completions = times[:, :, 0].copy()
+    col_completions = times[:, 0, :].copy()
+    for j in range(1, side):
+        np.maximum(row_completions, times[:, :, j], out=row_completions)
+        np.maximum(col_completions, times[:, j, :], out=col_completions)
 
+    line_completions = np.minimum(row_completions, col_completions)
+    wins = line_completions[:, 0].copy()
+    for j in range(1, side):
+        np.minimum(wins, line_completions[:, j], out=wins)
+    return wins, times
 
-def solve1(boards: List[BingoBoard], nums: List[int]) -> int:
+
+def _score(boards: 'np.ndarray', times: 'np.ndarray', nums: List[int], board: int, win_time: int) -> int:
+    unmarked_sum = int(boards[board][times[board] > win_time].sum())
+    return unmarked_sum * nums[win_time]
+
+
+def solve1(boards: 'np.ndarray', nums: List[int]) -> int:
+    wins, times = win_times(boards, nums)
+    if len(wins) == 0 or wins.min() == len(nums):
+        # No board wins
+        return -1
+    first = int(np.argmin(wins))
+    return _score(boards, times, nums, first, int(wins[first]))
+
+
+def solve2(boards: 'np.ndarray', nums: List[int]) -> int:
+    wins, times = win_times(boards, nums)
+    if len(wins) == 0 or wins.max() == len(nums):
+        # Some board never wins
+        return -1
+    # Of the boards winning last, the simulation marks the highest last
+    last = len(wins) - 1 - int(np.argmax(wins[::-1]))
+    return _score(boards, times, nums, last, int(wins[last]))
+
+
+"""
+Simulation: every board is marked draw by draw. The marks live outside the
+boards, so boards built once replay any number of draw sequences.
+"""
+
+
+def bingo_boards(boards: 'np.ndarray') -> List[BingoBoard]:
+    return [BingoBoard(board) for board in boards.tolist()]
+
+
+def solve1_v2(boards: 'np.ndarray', nums: List[int]) -> int:
+    boards = bingo_boards(boards)
+    marks = [0 for _ in range(len(boards))]
     for num in nums:
-        for board in boards:
-            if board.mark(num):
-                return board.get_score(num)
+        for i, board in enumerate(boards):
+            marks[i], won = board.mark(marks[i], num)
+            if won:
+                return board.get_score(marks[i], num)
     return -1
 
 
-def solve2(boards: List[BingoBoard], nums: List[int]) -> int:
+def solve2_v2(boards: 'np.ndarray', nums: List[int]) -> int:
+    boards = bingo_boards(boards)
+    marks = [0 for _ in range(len(boards))]
     ignore = [False for _ in range(len(boards))]
     winning_boards = 0
     
@@ -88,13 +219,14 @@ def solve2(boards: List[BingoBoard], nums: List[int]) -> int:
                 # This board already won.
                 continue
 
-            if board.mark(num):
+            marks[i], won = board.mark(marks[i], num)
+            if won:
                 winning_boards += 1
                 ignore[i] = True
 
                 if winning_boards == len(boards):
                     # That was the last one!
-                    return board.get_score(num)
+                    return board.get_score(marks[i], num)
                 
     return -1
 
@@ -0,0 +1,36 @@
+import random
+import sys
+from typing import TextIO
+
+
+FLOOR_SIZE = 1000
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` horizontal, vertical or 45 degree vent lines on a
+    FLOOR_SIZE x FLOOR_SIZE floor.
+    """
+    for _ in range(size):
+        x1, y1 = rng.randrange(FLOOR_SIZE), rng.randrange(FLOOR_SIZE)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(FLOOR_SIZE), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(FLOOR_SIZE)
+        else:
+            x_sign = rng.choice((-1, 1))
+            y_sign = rng.choice((-1, 1))
+            max_len = min(x1 if x_sign < 0 else FLOOR_SIZE - 1 - x1,
+                          y1 if y_sign < 0 else FLOOR_SIZE - 1 - y1)
+            length = rng.randint(0, max_len)
+            x2, y2 = x1 + x_sign * length, y1 + y_sign * length
+        file_handle.write(f"{x1},{y1} -> {x2},{y2}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,5 +1,17 @@
+import os
 import sys
-from typing import List
+import bisect
+import collections
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+Line = Tuple[int, int, int, int]
 
 
 class SparseFloor:
@@ -13,10 +25,8 @@ class SparseFloor:
         self.ys = 0
         self.ignore_diag_lines = ignore_diagonal_lines
 
-    def add_line(self, line: List[List[str]]) -> None:
-        assert len(line) == 2
-        x1, y1 = int(line[0][0]), int(line[0][1])
-        x2, y2 = int(line[1][0]), int(line[1][1])
+    def add_line(self, line: Line) -> None:
+        x1, y1, x2, y2 = line
 
         self.xs = max(self.xs, max(x1, x2) + 1)
         self.ys = max(self.ys, max(y1, y2) + 1)
@@ -56,20 +66,19 @@ class SparseFloor:
         return 0
 
 
-def _read_input(path: str, ignore_diag_lines) -> SparseFloor:
-    with open(path, "r") as file_handle:
-        file_content = [[pos.split(',') for pos in line[:-1].split(' -> ')] for line in file_handle.readlines()]
-    
+def read_input(path: str) -> List[Line]:
+    return loader.read_int_tuples(path, 4)
+
+
+def _build_floor(lines: List[Line], ignore_diag_lines: bool) -> SparseFloor:
     sparse_floor = SparseFloor(ignore_diagonal_lines=ignore_diag_lines)
-    for line in file_content:
+    for line in lines:
         sparse_floor.add_line(line)
 
     return sparse_floor
 
 
-def _count(path: str, diag_lines: bool) -> int:
-    sparse_floor = _read_input(path, diag_lines)
-
+def _count_overlaps(sparse_floor: SparseFloor) -> int:
     cnt = 0
 
     xs, ys = sparse_floor.get_floor_size()
@@ -81,15 +90,322 @@ def _count(path: str, diag_lines: bool) -> int:
     return cnt
 
 
-def solve1(path: str) -> int:
-    return _count(path, True)
+def _count(lines: List[Line], ignore_diag_lines: bool) -> int:
+    return _count_overlaps(_build_floor(lines, ignore_diag_lines))
+
+
+"""
+Dense floor: rather than adding every point of every line, each family of
+lines (horizontal, vertical and the two diagonals) marks only its two ends
+in a difference array, +1 on the first point and -1 past the last, which a
+cumulative sum along the family's direction turns into counts. Diagonal
+lines are straightened by skewing their array, one row shifted per step,
+and a strided view shifts it back onto the floor. The floor is processed
+in bands of rows, lines crossing a band being clipped to it, so memory
+stays bounded by BAND_CELLS however large the floor.
+"""
+
+# Cells of the per-band arrays
+BAND_CELLS = 1 << 22
+
+
+def _line_array(lines: List[Line]) -> 'np.ndarray':
+    # Lines as rows (x1, y1, x2, y2), oriented so that y1 <= y2
+    segments = np.array(lines, dtype=np.int64).reshape(-1, 4)
+    assert np.all(segments >= 0)
+    flip = segments[:, 1] > segments[:, 3]
+    segments[flip] = segments[flip][:, [2, 3, 0, 1]]
+    return segments
+
+
+def _add_runs(diff: 'np.ndarray', rows: 'np.ndarray', cols: 'np.ndarray', ends: 'np.ndarray',
+              axis: int) -> None:
+    # Runs from (rows, cols) up to ends (inclusive) along the axis
+    np.add.at(diff, (rows, cols), 1)
+    if axis == 0:
+        np.add.at(diff, (ends + 1, cols), -1)
+    else:
+        np.add.at(diff, (rows, ends + 1), -1)
+
+
+def _band_counts(segments: 'np.ndarray', top: int, height: int, width: int,
+                 ignore_diag_lines: bool) -> 'np.ndarray':
+    x1, y1, x2, y2 = segments.T
+    horizontal = y1 == y2
+    vertical = (x1 == x2) & ~horizontal
+    counts = np.zeros((height, width), dtype=np.int32)
+
+    # Horizontal lines lie within a single row
+    h = horizontal & (y1 >= top) & (y1 < top + height)
+    diff = np.zeros((height, width + 1), dtype=np.int32)
+    _add_runs(diff, y1[h] - top, np.minimum(x1[h], x2[h]), np.maximum(x1[h], x2[h]), axis=1)
+    counts += np.cumsum(diff, axis=1, dtype=np.int32)[:, :width]
+
+    # The other lines are clipped to the rows of the band
+    first = np.maximum(y1, top) - top
+    last = np.minimum(y2, top + height - 1) - top
+    crossing = first <= last
+
+    v = vertical & crossing
+    diff = np.zeros((height + 1, width), dtype=np.int32)
+    _add_runs(diff, first[v], x1[v], last[v], axis=0)
+    counts += np.cumsum(diff, axis=0, dtype=np.int32)[:height]
+
+    if ignore_diag_lines:
+        return counts
+
+    # Down-right lines keep x - row, which is the column of the skewed array
+    # shifted by height to stay non-negative
+    d = ~horizontal & ~vertical & (x2 > x1) & crossing
+    diff = np.zeros((height + 1, width + height + 1), dtype=np.int32)
+    _add_runs(diff, first[d], x1[d] - (y1[d] - top) + height, last[d], axis=0)
+    skewed = np.cumsum(diff, axis=0, dtype=np.int32)
+    item = skewed.itemsize
+    counts += np.lib.stride_tricks.as_strided(skewed.ravel()[height:], shape=(height, width),
+                                              strides=(skewed.strides[0] - item, item))
+
+    # Down-left lines keep x + row
+    a = ~horizontal & ~vertical & (x2 < x1) & crossing
+    diff = np.zeros((height + 1, width + height), dtype=np.int32)
+    _add_runs(diff, first[a], x1[a] + (y1[a] - top), last[a], axis=0)
+    skewed = np.cumsum(diff, axis=0, dtype=np.int32)
+    counts += np.lib.stride_tricks.as_strided(skewed, shape=(height, width),
+                                              strides=(skewed.strides[0] + item, item))
+    return counts
+
+
+def _count_dense(lines: List[Line], ignore_diag_lines: bool) -> int:
+    segments = _line_array(lines)
+    if len(segments) == 0:
+        return 0
+    width = int(segments[:, [0, 2]].max()) + 1
+    floor_height = int(segments[:, 3].max()) + 1
+
+    band_height = max(1, BAND_CELLS // (width + 1))
+    cnt = 0
+    for top in range(0, floor_height, band_height):
+        height = min(band_height, floor_height - top)
+        counts = _band_counts(segments, top, height, width, ignore_diag_lines)
+        cnt += int(np.count_nonzero(counts >= 2))
+    return cnt
+
+
+def solve1(lines: List[Line]) -> int:
+    return _count_dense(lines, True)
+
+
+def solve2(lines: List[Line]) -> int:
+    return _count_dense(lines, False)
+
+
+def solve1_v2(lines: List[Line]) -> int:
+    return _count(lines, True)
+
+
+def solve2_v2(lines: List[Line]) -> int:
+    return _count(lines, False)
+
+
+"""
+Sweep line: nothing is rasterized, so the cost depends on the number of
+lines and of intersections rather than on the floor's area.
+
+Every line belongs to a family (horizontal, vertical, and the two
+diagonals) and, within it, to a group of collinear lines sharing a key
+(y for horizontal lines, x for vertical ones, x - y and x + y for the
+diagonals). Points are located along a group by a parameter (x for
+horizontal lines, y otherwise). A group's intervals are merged into their
+union and the points covered at least twice within the group.
+
+Lines of different families cross in at most one point. For every pair of
+families one of them is swept across the other, in coordinates where the
+first family's groups are rows and the second family's groups columns,
+collecting the crossings of their unions into a set. A point overlapped
+within groups of several families is also a crossing, so those points are
+counted once through the crossings.
+"""
+
+
+Interval = Tuple[int, int]
+
+
+class Family:
+    name: str
+    key: Callable[[int, int], int]
+    param: Callable[[int, int], int]
+    # The point of a group key and a parameter
+    point: Callable[[int, int], Tuple[int, int]]
+
+    def __init__(self, name: str, key: Callable[[int, int], int], param: Callable[[int, int], int],
+                 point: Callable[[int, int], Tuple[int, int]]) -> None:
+        self.name = name
+        self.key = key
+        self.param = param
+        self.point = point
+
+
+HORIZONTAL = Family("horizontal", lambda x, y: y, lambda x, y: x, lambda k, t: (t, k))
+VERTICAL = Family("vertical", lambda x, y: x, lambda x, y: y, lambda k, t: (k, t))
+DOWN_RIGHT = Family("down-right", lambda x, y: x - y, lambda x, y: y, lambda k, t: (k + t, t))
+DOWN_LEFT = Family("down-left", lambda x, y: x + y, lambda x, y: y, lambda k, t: (k - t, t))
+
+
+def _family(line: Line) -> Family:
+    x1, y1, x2, y2 = line
+    if y1 == y2:
+        return HORIZONTAL
+    if x1 == x2:
+        return VERTICAL
+    assert abs(x2 - x1) == abs(y2 - y1)
+    return DOWN_RIGHT if (x2 - x1) == (y2 - y1) else DOWN_LEFT
+
+
+def _merge_intervals(intervals: List[Interval]) -> Tuple[List[Interval], List[Interval]]:
+    """
+    The union of the intervals and the points covered at least twice, both
+    as sorted disjoint intervals.
+    """
+    intervals = sorted(intervals)
+    union = []
+    overlaps = []
+    lo, hi = intervals[0]
+    for next_lo, next_hi in intervals[1:]:
+        if next_lo <= hi:
+            # Starts within the union so far, which is [lo, hi]
+            overlap = (next_lo, min(hi, next_hi))
+            if len(overlaps) > 0 and overlap[0] <= overlaps[-1][1] + 1:
+                overlaps[-1] = (overlaps[-1][0], max(overlaps[-1][1], overlap[1]))
+            else:
+                overlaps.append(overlap)
+            hi = max(hi, next_hi)
+        elif next_lo == hi + 1:
+            hi = next_hi
+        else:
+            union.append((lo, hi))
+            lo, hi = next_lo, next_hi
+    union.append((lo, hi))
+    return union, overlaps
+
+
+class LineGroups:
+    # Per family, the union and the overlaps of every group by key
+    unions: Dict[str, Dict[int, List[Interval]]]
+    overlaps: Dict[str, Dict[int, List[Interval]]]
+    families: List[Family]
+
+    def __init__(self, lines: List[Line], families: List[Family]) -> None:
+        self.families = families
+        intervals = {family.name: collections.defaultdict(list) for family in families}
+        for line in lines:
+            family = _family(line)
+            if family.name not in intervals:
+                continue
+            x1, y1, x2, y2 = line
+            t1, t2 = family.param(x1, y1), family.param(x2, y2)
+            intervals[family.name][family.key(x1, y1)].append((min(t1, t2), max(t1, t2)))
+
+        self.unions = {}
+        self.overlaps = {}
+        for name, groups in intervals.items():
+            self.unions[name] = {}
+            self.overlaps[name] = {}
+            for key, group in groups.items():
+                self.unions[name][key], self.overlaps[name][key] = _merge_intervals(group)
+
+    def overlapped_families(self, x: int, y: int) -> int:
+        # In how many families the point is overlapped within its group
+        count = 0
+        for family in self.families:
+            overlaps = self.overlaps[family.name].get(family.key(x, y))
+            if overlaps is None:
+                continue
+            t = family.param(x, y)
+            i = bisect.bisect_right(overlaps, (t, float("inf"))) - 1
+            if i >= 0 and overlaps[i][0] <= t <= overlaps[i][1]:
+                count += 1
+        return count
+
+
+def _crossings(groups: LineGroups, rows: Family, cols: Family, points: Set[Tuple[int, int]]) -> None:
+    """
+    Adds the points where the unions of the two families cross. Sweeping
+    along cols' key, rows' groups are active over the range of cols' keys
+    their intervals span, and every cols group picks the active rows whose
+    key its interval spans.
+    """
+    events = []
+    for key, union in groups.unions[rows.name].items():
+        for lo, hi in union:
+            a, b = cols.key(*rows.point(key, lo)), cols.key(*rows.point(key, hi))
+            events.append((min(a, b), 0, key, 0))
+            events.append((max(a, b), 2, key, 0))
+    for key, union in groups.unions[cols.name].items():
+        for lo, hi in union:
+            a, b = rows.key(*cols.point(key, lo)), rows.key(*cols.point(key, hi))
+            events.append((key, 1, min(a, b), max(a, b)))
+    # At the same position, rows start before and end after the queries
+    events.sort()
+
+    active = []
+    for position, kind, a, b in events:
+        if kind == 0:
+            bisect.insort(active, a)
+        elif kind == 2:
+            active.pop(bisect.bisect_left(active, a))
+        else:
+            for row_key in active[bisect.bisect_left(active, a):bisect.bisect_right(active, b)]:
+                # Along a row, cols' key changes by step per parameter, so
+                # the crossing may fall between two points (the diagonals)
+                base = cols.key(*rows.point(row_key, 0))
+                step = cols.key(*rows.point(row_key, 1)) - base
+                if (position - base) % step == 0:
+                    points.add(rows.point(row_key, (position - base) // step))
+
+
+def _count_sweep(lines: List[Line], families: List[Family]) -> int:
+    groups = LineGroups(lines, families)
+
+    crossings = set()
+    for i, rows in enumerate(families):
+        for cols in families[i + 1:]:
+            _crossings(groups, rows, cols, crossings)
+
+    cnt = sum(hi - lo + 1 for family in families
+              for overlaps in groups.overlaps[family.name].values() for lo, hi in overlaps)
+    # Crossings count once, however many families they are overlapped in
+    for x, y in crossings:
+        cnt += 1 - groups.overlapped_families(x, y)
+    return cnt
+
+
+def solve1_v3(lines: List[Line]) -> int:
+    return _count_sweep(lines, [HORIZONTAL, VERTICAL])
+
+
+def solve2_v3(lines: List[Line]) -> int:
+    return _count_sweep(lines, [HORIZONTAL, VERTICAL, DOWN_RIGHT, DOWN_LEFT])
+
 
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    # Memory is bounded by the points covered on the floor, not by the
+    # number of lines
+    floor1 = SparseFloor(ignore_diagonal_lines=True)
+    floor2 = SparseFloor(ignore_diagonal_lines=False)
+    for line in lines:
+        if line == "":
+            continue
+        x1, y1, x2, y2 = loader.parse_ints(line.encode())
+        floor1.add_line((x1, y1, x2, y2))
+        floor2.add_line((x1, y1, x2, y2))
 
-def solve2(path: str) -> int:
-    return _count(path, False)
+    # Only the covered points are stored, so counting them skips the rest of
+    # the bounding box
+    return (sum(1 for v in floor1.floor.values() if v > 1),
+            sum(1 for v in floor2.floor.values() if v > 1))
 
 
 if __name__ == "__main__":
     input_path = sys.argv[1]
-    print(solve1(input_path))
-    print(solve2(input_path))
\ No newline at end of file
+    lines = read_input(input_path)
+    print(solve1(lines))
+    print(solve2(lines))
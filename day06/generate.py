@@ -0,0 +1,18 @@
+import random
+import sys
+from typing import TextIO
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` lanternfish timers on a single line.
+    """
+    file_handle.write(",".join(str(rng.randint(1, 5)) for _ in range(size)) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,12 +1,17 @@
+import os
 import sys
-from typing import List
+import functools
+from typing import List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 def read_input(path: str) -> List[int]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-        assert len(file_content) == 1
-    l = list(map(int, file_content[0].split(',')))
+    l = loader.read_comma_ints(path)
 
     state = [0 for _ in range(9)]
     for x in l:
@@ -39,6 +44,41 @@ def solve2(state: List[int]) -> int:
     return _simulate(256, state)
 
 
+"""
+Batch mode: the simulation is linear in the state, so a fish with timer t
+always turns into the same number of fish. Every input's answer is then its
+state vector times those per-timer counts, one matrix product for the batch.
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _fish_per_timer(days: int) -> Tuple[int, ...]:
+    return tuple(_simulate(days, [1 if t == timer else 0 for t in range(9)]) for timer in range(9))
+
+
+def precompute() -> None:
+    _fish_per_timer(80)
+    _fish_per_timer(256)
+
+
+def _simulate_batch(days: int, inputs: List[Tuple[List[int]]]) -> List[int]:
+    states = np.array([state for state, in inputs], dtype=np.int64).reshape(-1, 9)
+    weights = _fish_per_timer(days)
+
+    if len(inputs) > 0 and int(states.sum(axis=1).max()) * max(weights) >= 2**63:
+        # Python ints past the int64 range
+        return (states.astype(object) @ np.array(weights, dtype=object)).tolist()
+    return (states @ np.array(weights, dtype=np.int64)).tolist()
+
+
+def solve1_batch(inputs: List[Tuple[List[int]]]) -> List[int]:
+    return _simulate_batch(80, inputs)
+
+
+def solve2_batch(inputs: List[Tuple[List[int]]]) -> List[int]:
+    return _simulate_batch(256, inputs)
+
+
 if __name__ == "__main__":
     input_path = sys.argv[1]
     init_state = read_input(input_path)
@@ -0,0 +1,21 @@
+import random
+import sys
+from typing import TextIO
+
+
+MAX_POSITION = 2000
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` crab positions on a single line.
+    """
+    file_handle.write(",".join(str(rng.randrange(MAX_POSITION)) for _ in range(size)) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,14 +1,14 @@
+import os
 import sys
 from typing import List
 import math
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 def read_input(path: str) -> List[int]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-        assert len(file_content) == 1
-        file_content = file_content[0]
-    return list(map(int, file_content.split(",")))
+    return loader.read_comma_ints(path)
 
 
 def _naive_median(l: List[int]) -> int:
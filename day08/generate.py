@@ -0,0 +1,48 @@
+import random
+import sys
+from typing import TextIO
+
+
+WIRES = "abcdefg"
+DIGIT_PATTERNS = [
+    "abcefg",   # 0
+    "cf",       # 1
+    "acdeg",    # 2
+    "acdfg",    # 3
+    "bcdf",     # 4
+    "abdfg",    # 5
+    "abdefg",   # 6
+    "acf",      # 7
+    "abcdefg",  # 8
+    "abcdfg",   # 9
+]
+
+
+def _scramble(pattern: str, wiring: dict, rng: random.Random) -> str:
+    segments = [wiring[w] for w in pattern]
+    rng.shuffle(segments)
+    return "".join(segments)
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` displays, each with its own random wiring.
+    """
+    for _ in range(size):
+        shuffled = list(WIRES)
+        rng.shuffle(shuffled)
+        wiring = dict(zip(WIRES, shuffled))
+
+        signal_patterns = [_scramble(p, wiring, rng) for p in DIGIT_PATTERNS]
+        rng.shuffle(signal_patterns)
+        output_values = [_scramble(rng.choice(DIGIT_PATTERNS), wiring, rng) for _ in range(4)]
+
+        file_handle.write(f"{' '.join(signal_patterns)} | {' '.join(output_values)}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
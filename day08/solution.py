@@ -1,5 +1,11 @@
+import os
 import sys
-from typing import List, Tuple
+import functools
+import itertools
+from typing import Dict, FrozenSet, Iterator, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
 
 
 class Signals:
@@ -17,12 +23,13 @@ class Signals:
         return self.output_value
 
 
+def _parse_signals(line: str) -> Signals:
+    signal = [x.split() for x in line.split(' | ')]
+    return Signals(signal[0], signal[1])
+
+
 def read_input(path: str) -> List[Signals]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-        file_content = [[x.split() for x in line[:-1].split(' | ')] for line in file_content]
-    
-    return [Signals(signal[0], signal[1]) for signal in file_content]
+    return [_parse_signals(line) for line in loader.read_lines(path)]
 
 
 """
@@ -87,27 +94,13 @@ def _get_unique_length_patterns(signal_patterns: List[str]) -> Tuple[str, str, s
     return one_pattern, four_pattern, seven_pattern, eight_pattern
 
 
-def solve1(signals: List[Signals]) -> int:
-    ones = 0
-    fours = 0
-    sevens = 0
-    eights = 0
+def _count_unique_length_outputs(signal: Signals) -> int:
+    unique_length_patterns = _get_unique_length_patterns(signal.get_signal_patterns())
+    return sum(output_val in unique_length_patterns for output_val in signal.get_output_values())
 
-    for signal in signals:
-        one_pattern, four_pattern, seven_pattern, eight_pattern = \
-                _get_unique_length_patterns(signal.get_signal_patterns())
-        
-        for output_val in signal.get_output_values():
-            if output_val == one_pattern:
-                ones += 1
-            elif output_val == four_pattern:
-                fours += 1
-            elif output_val == seven_pattern:
-                sevens += 1
-            elif output_val == eight_pattern:
-                eights += 1
-
-    return ones + fours + sevens + eights
+
+def solve1(signals: List[Signals]) -> int:
+    return sum(_count_unique_length_outputs(signal) for signal in signals)
 
 
 def _set_diff(signal1: List[str], signal2: List[str]) -> List[str]:
@@ -208,21 +201,70 @@ def _infer_numbers(signal_patterns: List[str]) -> dict:
 
     return nums
 
+
+def _output_value(signal: Signals, patterns_map: dict) -> int:
+    value = 0
+    for output_val in signal.get_output_values():
+        digit = patterns_map[output_val]
+        value = value * 10 + digit
+    return value
+
+
 def solve2(signals: List[Signals]) -> int:
     out = 0
 
     for signal in signals:
         patterns_map = _infer_numbers(signal.get_signal_patterns())
-
-        value = 0
-        for output_val in signal.get_output_values():
-            digit = patterns_map[output_val]
-            value = value * 10 + digit
-        out += value
+        out += _output_value(signal, patterns_map)
 
     return out
 
 
+"""
+Batch mode: there are only 7! ways to scramble the wires, so instead of
+inferring the wires of every signal, the decoders of all of them are built
+once and looked up by the set of ten patterns.
+"""
+
+
+WIRES = "abcdefg"
+# Wires of each digit when unscrambled
+DIGIT_WIRES = ["abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf", "abcdefg", "abcdfg"]
+
+
+@functools.lru_cache(maxsize=None)
+def _decoder_table() -> Dict[FrozenSet[str], Dict[str, int]]:
+    table = {}
+    for scrambled in itertools.permutations(WIRES):
+        wire_map = dict(zip(WIRES, scrambled))
+        decoder = {''.join(sorted(wire_map[w] for w in wires)): digit for digit, wires in enumerate(DIGIT_WIRES)}
+        table[frozenset(decoder)] = decoder
+    return table
+
+
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    table = _decoder_table()
+    out1 = 0
+    out2 = 0
+    for line in lines:
+        if line == "":
+            continue
+        signal = _parse_signals(line)
+        out1 += _count_unique_length_outputs(signal)
+        out2 += _output_value(signal, table[frozenset(signal.get_signal_patterns())])
+    return out1, out2
+
+
+def precompute() -> None:
+    _decoder_table()
+
+
+def solve2_batch(inputs: List[Tuple[List[Signals]]]) -> List[int]:
+    table = _decoder_table()
+    return [sum(_output_value(signal, table[frozenset(signal.get_signal_patterns())]) for signal in signals)
+            for signals, in inputs]
+
+
 if __name__ == "__main__":
     input_path = sys.argv[1]
     l = read_input(input_path)
@@ -0,0 +1,24 @@
+import random
+import sys
+from typing import TextIO
+
+
+# Larger heightmaps take minutes to solve
+MAX_SIZE = 2000
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a `size` x `size` heightmap of digits, `size` capped at MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    for _ in range(size):
+        file_handle.write("".join(rng.choices("0123456789", k=size)) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
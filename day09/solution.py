@@ -1,81 +1,76 @@
+import os
 import sys
-from typing import List
+from typing import Dict, List, Tuple
 from collections import deque
+import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.grid import Grid, NEIGHBORS_4
 
-def read_input(path: str) -> List[List[int]]:
-    with open(path, "r") as file_handle:
-        file_content = [list(map(int, line[:-1])) for line in file_handle.readlines()]
-    return file_content
 
+# Heights are 0-9, so a wall of 9s stops every basin and nothing is lower than 10
+WALL = 9
+ABOVE_ALL = 10
 
-def _get_low_points(l: List[List[int]]) -> int:
-    low_points = []
 
-    for i in range(len(l)):
-        for j in range(len(l[i])):
-            curr = l[i][j]
-            is_low = True
+def read_input(path: str) -> Grid:
+    with loader.mapped(path) as buf:
+        return Grid.from_digits(buf)
 
-            if i - 1 >= 0 and curr >= l[i-1][j]:
-                is_low = False
 
-            if i + 1 < len(l) and curr >= l[i+1][j]:
-                is_low = False
+def pack_input(grid: Grid) -> Dict[str, np.ndarray]:
+    return {"cells": grid.cells}
 
-            if j - 1 >= 0 and curr >= l[i][j-1]:
-                is_low = False
 
-            if j + 1 < len(l[i]) and curr >= l[i][j+1]:
-                is_low = False
+def unpack_input(arrays: Dict[str, np.ndarray]) -> Grid:
+    return Grid(arrays["cells"])
 
-            if is_low:
-                low_points.append((i, j))
 
-    return low_points
+def _get_low_points(grid: Grid) -> List[Tuple[int, int]]:
+    is_low = np.ones(grid.shape, dtype=bool)
+    for neighbor in grid.neighbors(4, fill=ABOVE_ALL):
+        is_low &= grid.cells < neighbor
+    return [(int(i), int(j)) for i, j in np.argwhere(is_low)]
 
 
-def solve1(l: List[List[int]]) -> int:
-    return len(_get_low_points(l))
+def solve1(grid: Grid) -> int:
+    return len(_get_low_points(grid))
 
 
-def solve2(l: List[List[int]]) -> int:
-    low_points = _get_low_points(l)
+def solve2(grid: Grid) -> int:
+    low_points = _get_low_points(grid)
+
+    # BFS over flat indices into the grid padded with walls: no bounds checks
+    heights = grid.padded(WALL).ravel().tolist()
+    offsets = grid.flat_offsets(NEIGHBORS_4)
 
     basin_sizes = []
 
     for i, j in low_points:
+        start = grid.flat_index(i, j)
+
         q = deque()
         visited = set()
-        
-        q.append((i, j))
-        visited.add((i, j))
-        
+
+        q.append(start)
+        visited.add(start)
+
         size = 0
 
         while len(q) > 0:
-            x, y = q.popleft()
-            cur_height = l[x][y]
+            x = q.popleft()
+            cur_height = heights[x]
             size += 1
 
-            if x - 1 >= 0 and 9 > l[x-1][y] and l[x-1][y] > cur_height and (x-1, y) not in visited:
-                q.append((x-1, y))
-                visited.add((x-1, y))
-            
-            if x + 1 < len(l) and 9 > l[x+1][y] and l[x+1][y] > cur_height and (x+1, y) not in visited:
-                q.append((x+1, y))
-                visited.add((x+1, y))
-
-            if y - 1 >= 0 and 9 > l[x][y-1] and l[x][y-1] > cur_height and (x, y-1) not in visited:
-                q.append((x, y-1))
-                visited.add((x, y-1))
-            
-            if y + 1 < len(l[x]) and 9 > l[x][y+1] and l[x][y+1] > cur_height and (x, y+1) not in visited:
-                q.append((x, y+1))
-                visited.add((x, y+1))
+            for offset in offsets:
+                y = x + offset
+                if WALL > heights[y] and heights[y] > cur_height and y not in visited:
+                    q.append(y)
+                    visited.add(y)
 
         basin_sizes.append(size)
-        
+
         if len(basin_sizes) == 4:
             basin_sizes.sort()
             basin_sizes = basin_sizes[1:]
@@ -87,4 +82,4 @@ if __name__ == "__main__":
     input_path = sys.argv[1]
     l = read_input(input_path)
     print(solve1(l))
-    print(solve2(l))
\ No newline at end of file
+    print(solve2(l))
@@ -0,0 +1,51 @@
+import random
+import sys
+from typing import List, TextIO, Tuple
+
+
+OPENING = "([{<"
+CLOSING = ")]}>"
+LINE_LENGTH = 100
+
+
+def _incomplete_line(rng: random.Random) -> Tuple[str, List[int]]:
+    # Random chunks that leave at least one chunk open, plus the open chunks
+    line = []
+    stack = []
+    while len(line) < LINE_LENGTH or len(stack) == 0:
+        if len(stack) > 0 and rng.random() < 0.45:
+            line.append(CLOSING[stack.pop()])
+        else:
+            kind = rng.randrange(len(OPENING))
+            stack.append(kind)
+            line.append(OPENING[kind])
+    return "".join(line), stack
+
+
+def _corrupted_line(rng: random.Random) -> str:
+    # Close the innermost open chunk with a wrong character
+    line, stack = _incomplete_line(rng)
+    return line + rng.choice([c for k, c in enumerate(CLOSING) if k != stack[-1]])
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` navigation lines, roughly half of them corrupted. The number
+    of incomplete lines is kept odd so the middle autocomplete score exists.
+    """
+    corrupted = [rng.random() < 0.5 for _ in range(size)]
+    incomplete = size - sum(corrupted)
+    if incomplete % 2 == 0:
+        corrupted[-1] = not corrupted[-1]
+
+    for is_corrupted in corrupted:
+        line = _corrupted_line(rng) if is_corrupted else _incomplete_line(rng)[0]
+        file_handle.write(line + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
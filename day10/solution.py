@@ -1,11 +1,13 @@
+import os
 import sys
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
 
 
 def read_input(path: str) -> List[str]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return [line[:-1] for line in file_content]
+    return loader.read_lines(path)
 
 
 def _syntax_analysis(s: str) -> Tuple[Optional[int], List[str]]:
@@ -31,47 +33,74 @@ def _syntax_analysis(s: str) -> Tuple[Optional[int], List[str]]:
     return None, stack
 
 
+SYNTAX_ERROR_SCORES = {
+    ')': 3,
+    ']': 57,
+    '}': 1197,
+    '>': 25137,
+}
+
+AUTOCOMPLETE_SCORES = {
+    '(': 1,
+    '[': 2,
+    '{': 3,
+    '<': 4
+}
+
+
+def _autocomplete_score(stack: List[str]) -> int:
+    autocomplete_score = 0
+    for i in range(len(stack) - 1, -1, -1):
+        autocomplete_score *= 5
+        autocomplete_score += AUTOCOMPLETE_SCORES[stack[i]]
+    return autocomplete_score
+
+
+def _middle_score(scores: List[int]) -> int:
+    assert len(scores) % 2 == 1
+    scores = sorted(scores)
+    return scores[len(scores) // 2]
+
+
 def solve1(l: List[str]) -> int:
-    CHAR_SCORES = {
-        ')': 3,
-        ']': 57,
-        '}': 1197,
-        '>': 25137,
-    }
-    
     score = 0
 
     for x in l:
         illegal_char, _ = _syntax_analysis(x)
         if illegal_char is not None:
-            score += CHAR_SCORES[illegal_char]
+            score += SYNTAX_ERROR_SCORES[illegal_char]
 
     return score
 
 
 def solve2(l: List[str]) -> int:
-    CHAR_SCORES = {
-        '(': 1,
-        '[': 2,
-        '{': 3,
-        '<': 4
-    }
-
     scores = []
 
     for x in l:
         illegal_char, stack = _syntax_analysis(x)
         if illegal_char is None:
             # Perform autocomplete for the incomplete lines
-            autocomplete_score = 0
-            for i in range(len(stack) - 1, -1, -1):
-                autocomplete_score *= 5
-                autocomplete_score += CHAR_SCORES[stack[i]]
-            scores.append(autocomplete_score)
+            scores.append(_autocomplete_score(stack))
 
-    assert len(scores) % 2 == 1
-    scores = sorted(scores)
-    return scores[len(scores) // 2]
+    return _middle_score(scores)
+
+
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    # Part 2 needs the middle score, so one integer per incomplete line is
+    # kept; the lines themselves are not
+    score = 0
+    scores = []
+
+    for x in lines:
+        if x == "":
+            continue
+        illegal_char, stack = _syntax_analysis(x)
+        if illegal_char is not None:
+            score += SYNTAX_ERROR_SCORES[illegal_char]
+        else:
+            scores.append(_autocomplete_score(stack))
+
+    return score, _middle_score(scores)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+import random
+import sys
+from typing import TextIO
+
+
+# Share of octopuses that deviate from the common energy level
+NOISE = 0.1
+# Every step touches every octopus, and larger grids take minutes
+MAX_SIZE = 500
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a `size` x `size` grid of octopus energy levels. Uniformly random
+    grids beyond the puzzle size almost never flash all at once (part 2), so
+    the grid is a common level with sparse noise, which synchronizes within
+    a few dozen steps. `size` is capped at MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    level = str(rng.randint(0, 9))
+    for _ in range(size):
+        row = [str(rng.randint(0, 9)) if rng.random() < NOISE else level for _ in range(size)]
+        file_handle.write("".join(row) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
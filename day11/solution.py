@@ -1,80 +1,72 @@
+import os
 import sys
-from typing import List
-from collections import deque
+from typing import Dict, Tuple
+import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.grid import Grid
 
-def read_input(path: str) -> List[List[int]]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return [list(map(int, list(line[:-1]))) for line in file_content]
 
+def read_input(path: str) -> Grid:
+    with loader.mapped(path) as buf:
+        return Grid.from_digits(buf)
 
-def _simulate_step(l: List[List[int]]) -> int:
-    flashes = 0
-    
-    for i in range(len(l)):
-        for j in range(len(l[i])):
-            if l[i][j] == 9:
-                # Expand the flashing to surrounding
-                q = deque()
-                q.append((i, j))
-
-                while len(q) > 0:
-                    x, y = q.popleft()
-
-                    l[x][y] += 1
-                    if l[x][y] == 10:
-                        # By only counting the flashes at 10, we ensure
-                        # to only count each flash just once
-                        flashes += 1
-                        
-                        # Expand
-                        if x - 1 >= 0:
-                            q.append((x-1, y))
-                            if y - 1 >= 0:
-                                q.append((x-1, y-1))
-                            if y + 1 < len(l[x]):
-                                q.append((x-1, y+1))
-
-                        if y - 1 >= 0:
-                            q.append((x, y-1))
-                        if y + 1 < len(l[x]):
-                            q.append((x, y+1))
-
-                        if x + 1 < len(l):
-                            q.append((x+1, y))
-                            if y - 1 >= 0:
-                                q.append((x+1, y-1))
-                            if y + 1 < len(l[x+1]):
-                                q.append((x+1, y+1))
-            else:
-                l[i][j] += 1
+
+def pack_input(grid: Grid) -> Dict[str, np.ndarray]:
+    return {"cells": grid.cells}
+
+
+def unpack_input(arrays: Dict[str, np.ndarray]) -> Grid:
+    return Grid(arrays["cells"])
+
+
+def _simulate_step(cells: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Returns the energy levels after one step and the number of flashes. The
+    given levels are left untouched.
+    """
+    cells = cells + 1
+    flashed = np.zeros(cells.shape, dtype=bool)
+
+    while True:
+        # By only expanding newly flashing octopuses, we ensure
+        # to only count each flash just once
+        flashing = (cells > 9) & ~flashed
+        if not flashing.any():
+            break
+        flashed |= flashing
+
+        # Expand the flashing to surrounding
+        cells += sum(Grid(flashing).neighbors(8, fill=False))
 
     # Now, we need to reset the flashes
-    l = [[0 if x > 9 else x for x in row] for row in l]
+    cells[flashed] = 0
 
-    return l, flashes
+    return cells, int(flashed.sum())
 
 
-def solve1(l: List[List[int]]) -> int:
+def solve1(grid: Grid) -> int:
+    cells = grid.cells
     flashes = 0
 
     SIMULATION_STEPS = 100
     for _ in range(SIMULATION_STEPS):
-        l, flashes_per_step = _simulate_step(l)
+        cells, flashes_per_step = _simulate_step(cells)
         flashes += flashes_per_step
 
     return flashes
 
 
-def solve2(l: List[List[int]]) -> int:
-    stop = len(l) * len(l[0])
+def solve2(grid: Grid) -> int:
+    cells = grid.cells
+    stop = cells.size
 
-    step = 1
+    step = 0
     flashes_per_step = 0
 
     while flashes_per_step != stop:
-        l, flashes_per_step = _simulate_step(l)
+        cells, flashes_per_step = _simulate_step(cells)
         step += 1
 
     return step
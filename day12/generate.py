@@ -0,0 +1,65 @@
+import random
+import sys
+from typing import List, TextIO
+
+
+START_NODE = 'start'
+END_NODE = 'end'
+RESERVED = {START_NODE, END_NODE}
+
+# Every big cave lets a path bounce between its neighbours, so keep them few
+MAX_BIG_CAVE_NEIGHBOURS = 3
+# The number of paths grows exponentially with the number of caves; past
+# this many small caves, counting them takes minutes
+MAX_SMALL_CAVES = 20
+
+
+def _cave_names(n: int) -> List[str]:
+    names = []
+    i = 26
+    while len(names) < n:
+        name = ""
+        x = i
+        while x > 0:
+            name = chr(ord('a') + x % 26) + name
+            x //= 26
+        if name not in RESERVED:
+            names.append(name)
+        i += 1
+    return names
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a cave system with `size` small caves (at most MAX_SMALL_CAVES)
+    connected as a random tree plus a few big caves. Big caves are never
+    adjacent, otherwise the number of paths would be infinite.
+    """
+    size = min(size, MAX_SMALL_CAVES)
+    small_caves = _cave_names(size)
+    big_caves = [name.upper() for name in _cave_names(max(1, size // 4))]
+
+    edges = []
+    for i in range(1, len(small_caves)):
+        edges.append((small_caves[rng.randrange(i)], small_caves[i]))
+
+    for big_cave in big_caves:
+        neighbours = rng.sample(small_caves, min(len(small_caves), MAX_BIG_CAVE_NEIGHBOURS))
+        for small_cave in neighbours:
+            edges.append((big_cave, small_cave))
+
+    edges.append((START_NODE, small_caves[0]))
+    edges.append((START_NODE, big_caves[0]))
+    edges.append((small_caves[-1], END_NODE))
+
+    rng.shuffle(edges)
+    for v1, v2 in edges:
+        file_handle.write(f"{v1}-{v2}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,5 +1,9 @@
+import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 START_NODE = 'start'
 END_NODE = 'end'
@@ -8,8 +12,7 @@ NOT_VISITED = False
 
 
 def read_input(path: str) -> dict:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
+    file_content = loader.read_lines(path)
 
     graph = {
         START_NODE: [],
@@ -17,7 +20,7 @@ def read_input(path: str) -> dict:
     }
 
     for edge in file_content:
-        edge = edge[:-1].split('-')
+        edge = edge.split('-')
         v1, v2 = edge[0], edge[1]
         
         if v1 not in graph:
@@ -0,0 +1,59 @@
+import random
+import sys
+from typing import List, TextIO
+
+
+# Size of the paper after all folds, as in the puzzle
+FINAL_X = 40
+FINAL_Y = 6
+
+
+def _unfold(coord: int, axes: List[int], rng: random.Random) -> int:
+    # Mirror the coordinate randomly at each fold line, innermost fold first
+    for axis in axes:
+        if rng.random() < 0.5:
+            coord = 2 * axis - coord
+    return coord
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` dots followed by the fold instructions. The paper is unfolded
+    from FINAL_X x FINAL_Y until it has room for about four cells per dot;
+    every dot is mirrored randomly at each unfold so none lies on a fold line.
+    """
+    folds = []
+    xs, ys = FINAL_X, FINAL_Y
+    while len(folds) < 2 or xs * ys < 4 * size:
+        # Unfold the relatively smaller dimension, keeping the aspect ratio
+        if xs * FINAL_Y <= ys * FINAL_X:
+            folds.append(("x", xs))
+            xs = 2 * xs + 1
+        else:
+            folds.append(("y", ys))
+            ys = 2 * ys + 1
+
+    x_axes = [axis for direction, axis in folds if direction == "x"]
+    y_axes = [axis for direction, axis in folds if direction == "y"]
+
+    dots = set()
+    # The solver derives the paper size from the dots, so the far edges need
+    # one; coordinate 0 mirrored at the outermost fold lands exactly there.
+    dots.add((xs - 1, _unfold(rng.randrange(FINAL_Y), y_axes, rng)))
+    dots.add((_unfold(rng.randrange(FINAL_X), x_axes, rng), ys - 1))
+    while len(dots) < size:
+        dots.add((_unfold(rng.randrange(FINAL_X), x_axes, rng), _unfold(rng.randrange(FINAL_Y), y_axes, rng)))
+
+    for x, y in dots:
+        file_handle.write(f"{x},{y}\n")
+    file_handle.write("\n")
+    for direction, axis in reversed(folds):
+        file_handle.write(f"fold along {direction}={axis}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
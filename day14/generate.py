@@ -0,0 +1,26 @@
+import random
+import sys
+from typing import TextIO
+
+
+ELEMENTS = "BCFHKNOPSV"
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a polymer template of length `size` and an insertion rule for every
+    pair of elements.
+    """
+    file_handle.write("".join(rng.choices(ELEMENTS, k=size)) + "\n")
+    file_handle.write("\n")
+    for a in ELEMENTS:
+        for b in ELEMENTS:
+            file_handle.write(f"{a}{b} -> {rng.choice(ELEMENTS)}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,15 +1,18 @@
+import os
 import sys
 from typing import Tuple
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 def read_input(path: str) -> Tuple[str, dict]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    
-    polymer_template = file_content[0][:-1]
+    file_content = loader.read_lines(path)
+
+    polymer_template = file_content[0]
     pair_insertion_rules = {}
     for rule in file_content[2:]:
-        rule = rule[:-1].split(" -> ")
+        rule = rule.split(" -> ")
         assert len(rule[0]) == 2 and len(rule[1]) == 1
         pair_insertion_rules[rule[0]] = rule[1]
 
@@ -1,108 +1,102 @@
+import os
 import sys
-from typing import List
 import heapq
-import math
+from typing import Dict
+import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.grid import Grid, NEIGHBORS_4
 
-def read_input(path: str) -> List[List[int]]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return [list(map(int, line[:-1])) for line in file_content]
 
+def read_input(path: str) -> Grid:
+    with loader.mapped(path) as buf:
+        return Grid.from_digits(buf)
+
+
+def pack_input(grid: Grid) -> Dict[str, np.ndarray]:
+    return {"cells": grid.cells}
+
+
+def unpack_input(arrays: Dict[str, np.ndarray]) -> Grid:
+    return Grid(arrays["cells"])
+
+
+def _dijkstra(grid: Grid) -> int:
+    # Cells are flat indices into the padded grid. The padding is marked as
+    # visited up front, which takes care of all bounds checks.
+    risks = grid.padded(0).ravel().tolist()
+    visited = bytearray(grid.border_mask().tobytes())
+    offsets = grid.flat_offsets(NEIGHBORS_4)
+
+    start = grid.flat_index(0, 0)
+    goal = grid.flat_index(grid.shape[0] - 1, grid.shape[1] - 1)
 
-def _dijkstra(l: List[List[int]]) -> int:
     q = []
-    visited = set()
 
-    q.append((0, (0, 0)))
-    visited.add((0, 0))
+    q.append((0, start))
+    visited[start] = 1
 
     while len(q) > 0:
-        risk, (i, j) = heapq.heappop(q)
-        if i == len(l)-1 and j == len(l[i])-1:
+        risk, x = heapq.heappop(q)
+        if x == goal:
             return risk
 
-        if i-1 >= 0 and (i-1, j) not in visited:
-            heapq.heappush(q, (risk + l[i-1][j], (i-1, j)))
-            visited.add((i-1, j))
+        for offset in offsets:
+            y = x + offset
+            if not visited[y]:
+                heapq.heappush(q, (risk + risks[y], y))
+                visited[y] = 1
+
+    return -1
 
-        if i+1 < len(l) and (i+1, j) not in visited:
-            heapq.heappush(q, (risk + l[i+1][j], (i+1, j)))
-            visited.add((i+1, j))
 
-        if j-1 >= 0 and (i, j-1) not in visited:
-            heapq.heappush(q, (risk + l[i][j-1], (i, j-1)))
-            visited.add((i, j-1))
+def solve1(grid: Grid) -> int:
+    return _dijkstra(grid)
 
-        if j+1 < len(l[i]) and (i, j+1) not in visited:
-            heapq.heappush(q, (risk + l[i][j+1], (i, j+1)))
-            visited.add((i, j+1))
 
-    return -1
+def _a_star(grid: Grid) -> int:
+    # The full map is the input tiled 5x5, every tile step adding 1 to the
+    # risk and wrapping around from 9 to 1
+    full_grid = grid.tile(5, 5, increment=1)
+    full_grid.cells[:] = (full_grid.cells - 1) % 9 + 1
 
+    n, m = full_grid.shape
 
-def solve1(l: List[List[int]]) -> int:
-    return _dijkstra(l)
-
-
-def _a_star(l: List[List[int]]) -> int:
-    n_small = len(l)
-    m_small = len(l[0])
-    
-    n = n_small * 5
-    m = m_small * 5
-
-    def get_risk(x, y):
-        block_x = x // n_small
-        block_y = y // m_small
-        row = x % n_small
-        col = y % m_small
-        r = l[row][col] + block_x + block_y
-        if r >= 10:
-            # We add at maximum 8!
-            return r - 9
-        return r
-
-    def h(x, y):
-        # Euclidean distance to goal as heuristic
-        return math.sqrt((x - (n-1))**2 + (y - (m-1))**2)
-    
-    q = []
-    visited = set()
+    # Euclidean distance to goal as heuristic
+    rows, cols = np.indices(full_grid.shape)
+    h = np.sqrt((rows - (n-1))**2 + (cols - (m-1))**2)
+    h = Grid(h).padded(0.0).ravel().tolist()
 
-    q.append((0, (0, 0, 0)))
-    visited.add((0, 0))
+    risks = full_grid.padded(0).ravel().tolist()
+    visited = bytearray(full_grid.border_mask().tobytes())
+    offsets = full_grid.flat_offsets(NEIGHBORS_4)
 
-    while len(q) > 0:
-        _, (risk, i, j) = heapq.heappop(q)
-        if i == n-1 and j == m-1:
-            return risk
+    start = full_grid.flat_index(0, 0)
+    goal = full_grid.flat_index(n - 1, m - 1)
 
-        if i-1 >= 0 and (i-1, j) not in visited:
-            new_risk = risk + get_risk(i-1, j)
-            heapq.heappush(q, (new_risk + h(i-1, j), (new_risk, i-1, j)))
-            visited.add((i-1, j))
+    q = []
 
-        if i+1 < n and (i+1, j) not in visited:
-            new_risk = risk + get_risk(i+1, j)
-            heapq.heappush(q, (new_risk + h(i+1, j), (new_risk, i+1, j)))
-            visited.add((i+1, j))
+    q.append((0, 0, start))
+    visited[start] = 1
 
-        if j-1 >= 0 and (i, j-1) not in visited:
-            new_risk = risk + get_risk(i, j-1)
-            heapq.heappush(q, (new_risk + h(i, j-1), (new_risk, i, j-1)))
-            visited.add((i, j-1))
+    while len(q) > 0:
+        _, risk, x = heapq.heappop(q)
+        if x == goal:
+            return risk
 
-        if j+1 < m and (i, j+1) not in visited:
-            new_risk = risk + get_risk(i, j+1)
-            heapq.heappush(q, (new_risk + h(i, j+1), (new_risk, i, j+1)))
-            visited.add((i, j+1))
+        for offset in offsets:
+            y = x + offset
+            if not visited[y]:
+                new_risk = risk + risks[y]
+                heapq.heappush(q, (new_risk + h[y], new_risk, y))
+                visited[y] = 1
 
     return -1
 
 
-def solve2(l: List[List[int]]) -> int:
-    return _a_star(l)
+def solve2(grid: Grid) -> int:
+    return _a_star(grid)
 
 
 if __name__ == "__main__":
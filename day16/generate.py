@@ -0,0 +1,112 @@
+import random
+import sys
+from typing import List, TextIO
+
+
+class PacketType:
+    SUM_OPERATOR = 0
+    PRODUCT_OPERATOR = 1
+    MIN_OPERATOR = 2
+    MAX_OPERATOR = 3
+    LITERAL = 4
+    GREATER_THAN_OPERATOR = 5
+    LESS_THAN_OPERATOR = 6
+    EQUAL_TO_OPERATOR = 7
+
+
+COMPARISON_OPERATORS = (
+    PacketType.GREATER_THAN_OPERATOR,
+    PacketType.LESS_THAN_OPERATOR,
+    PacketType.EQUAL_TO_OPERATOR,
+)
+OPERATORS = (
+    PacketType.SUM_OPERATOR,
+    PacketType.PRODUCT_OPERATOR,
+    PacketType.MIN_OPERATOR,
+    PacketType.MAX_OPERATOR,
+) + COMPARISON_OPERATORS
+
+# The solver recurses once per nesting level
+MAX_DEPTH = 200
+MAX_CHILDREN = 4
+MAX_TOTAL_LENGTH = (1 << 15) - 1
+
+
+def _header(version: int, packet_type: int) -> str:
+    return f"{version:03b}{packet_type:03b}"
+
+
+def _literal(out: List[str], rng: random.Random) -> int:
+    value = rng.randrange(1 << 16)
+    groups = f"{value:b}"
+    groups = groups.zfill(-(-len(groups) // 4) * 4)
+
+    bits = [_header(rng.randrange(8), PacketType.LITERAL)]
+    for i in range(0, len(groups), 4):
+        last = i + 4 == len(groups)
+        bits.append(("0" if last else "1") + groups[i:i+4])
+
+    bits = "".join(bits)
+    out.append(bits)
+    return len(bits)
+
+
+def _split_budget(budget: int, num_children: int, rng: random.Random) -> List[int]:
+    cuts = sorted(rng.sample(range(1, budget), num_children - 1))
+    return [b - a for a, b in zip([0] + cuts, cuts + [budget])]
+
+
+def _packet(out: List[str], budget: int, depth: int, rng: random.Random, bounded: bool = False) -> int:
+    """
+    Appends the bits of a packet tree with about `budget` packets to `out`
+    and returns the number of bits written. A bounded packet evaluates to 0
+    or 1, which keeps products of whole sub-trees from exploding.
+    """
+    if budget <= 2 or depth >= MAX_DEPTH:
+        return _literal(out, rng)
+
+    packet_type = rng.choice(COMPARISON_OPERATORS if bounded else OPERATORS)
+    header_idx = len(out)
+    out.append("")  # Filled in once the length of the sub-packets is known
+
+    if packet_type in COMPARISON_OPERATORS:
+        num_children = 2
+    elif rng.random() < 0.3:
+        # Chains of single-child operators make the tree deep
+        num_children = 1
+    else:
+        num_children = rng.randint(1, min(MAX_CHILDREN, budget - 1))
+
+    n_bits = 0
+    for child_budget in _split_budget(budget - 1, num_children, rng):
+        n_bits += _packet(out, child_budget, depth + 1, rng,
+                          bounded=packet_type == PacketType.PRODUCT_OPERATOR)
+
+    header = _header(rng.randrange(8), packet_type)
+    if n_bits <= MAX_TOTAL_LENGTH and rng.random() < 0.5:
+        header += f"0{n_bits:015b}"
+    else:
+        header += f"1{num_children:011b}"
+    out[header_idx] = header
+
+    return len(header) + n_bits
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a transmission holding a packet tree of about `size` packets,
+    nested at most MAX_DEPTH levels deep.
+    """
+    out = []
+    _packet(out, size, 0, rng)
+    bits = "".join(out)
+    bits += "0" * (-len(bits) % 4)
+    file_handle.write(f"{int(bits, 2):0{len(bits) // 4}X}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,17 +1,20 @@
+import os
 import sys
 from typing import List, Tuple
 from bitarray import bitarray
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 def _parse_to_binary(hex_str: str) -> bitarray:
     return bitarray("".join(['{0:04b}'.format(int(h, 16)) for h in hex_str]))
 
 
 def read_input(path: str) -> bitarray:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-        assert len(file_content) == 1
-    return _parse_to_binary(file_content[0][:-1])
+    file_content = loader.read_lines(path)
+    assert len(file_content) == 1
+    return _parse_to_binary(file_content[0])
 
 
 class PacketType:
@@ -0,0 +1,28 @@
+import random
+import sys
+from typing import TextIO
+
+
+# The solvers search velocities up to 1000, so the target stays well within
+MAX_SIZE = 500
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes a target area roughly `size` steps to the right of and below the
+    launcher, `size` capped at MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    x_from = rng.randint(size, 2 * size)
+    x_to = x_from + rng.randint(max(1, size // 4), max(1, size // 2))
+    y_to = -rng.randint(size, 2 * size)
+    y_from = y_to - rng.randint(max(1, size // 4), max(1, size // 2))
+    file_handle.write(f"target area: x={x_from}..{x_to}, y={y_from}..{y_to}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,13 +1,17 @@
+import os
 import sys
 from typing import List, Tuple, Optional
 import math
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 def read_input(path: str) -> List[List[int]]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()[0][:-1]
-    file_content = file_content[len("target area: "):].split(", ")
-    return [list(map(int, x[2:].split(".."))) for x in file_content]
+    # "target area: x=<from>..<to>, y=<from>..<to>"
+    with loader.mapped(path) as buf:
+        x_from, x_to, y_from, y_to = loader.parse_ints(buf)
+    return [[x_from, x_to], [y_from, y_to]]
 
 
 def _gaussian_sum_formula(i: int) -> int:
@@ -0,0 +1,32 @@
+import random
+import sys
+from typing import TextIO
+
+
+# Reduced snailfish numbers have no pair nested inside four pairs
+MAX_PAIR_DEPTH = 3
+# Part 2 adds every ordered pair of numbers, quadratic in their count
+MAX_SIZE = 300
+
+
+def _snail_number(depth: int, rng: random.Random) -> str:
+    if depth > MAX_PAIR_DEPTH or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randint(0, 9))
+    return f"[{_snail_number(depth + 1, rng)},{_snail_number(depth + 1, rng)}]"
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` reduced snailfish numbers, at most MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    for _ in range(size):
+        file_handle.write(_snail_number(0, rng) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
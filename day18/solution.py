@@ -1,7 +1,11 @@
+import os
 import sys
 from typing import List, Tuple
 import abc
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+
 
 class Node(object):
     parent: 'Node'
@@ -182,15 +186,14 @@ def _parse_pair(pair: str) -> List[Pair]:
 
 
 def read_input(path: str) -> List[Pair]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return [_parse_pair(line[:-1]) for line in file_content]
+    return [_parse_pair(line) for line in loader.read_lines(path)]
 
 
 def solve1(snail_numbers: List[Pair]) -> int:
-    current = snail_numbers[0]
+    # Additions reduce in place, so work on copies
+    current = snail_numbers[0].copy()
     for i in range(1, len(snail_numbers)):
-        current = current.add(snail_numbers[i])
+        current = current.add(snail_numbers[i].copy())
     return current.magnitude()
 
 
@@ -212,5 +215,4 @@ if __name__ == "__main__":
     input_path = sys.argv[1]
     l = read_input(input_path)
     print(solve1(l))
-    l = read_input(input_path)
     print(solve2(l))
\ No newline at end of file
@@ -0,0 +1,34 @@
+import random
+import sys
+from typing import TextIO
+
+
+ALGORITHM_LENGTH = 512
+# The image grows by two pixels a step over 50 steps; larger ones take minutes
+MAX_SIZE = 2000
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes an enhancement algorithm and a `size` x `size` image. If the
+    algorithm lights up the dark infinity, it must turn it dark again in the
+    next step, otherwise the number of lit pixels is infinite. `size` is
+    capped at MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    algorithm = rng.choices("#.", k=ALGORITHM_LENGTH)
+    if algorithm[0] == "#":
+        algorithm[-1] = "."
+    file_handle.write("".join(algorithm) + "\n")
+    file_handle.write("\n")
+
+    for _ in range(size):
+        file_handle.write("".join(rng.choices("#.", k=size)) + "\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
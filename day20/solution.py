@@ -1,98 +1,70 @@
+import os
 import sys
-from typing import List, Tuple
+from typing import List
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.grid import Grid, WINDOW_3X3
 
 
 LIGHT = 1
 DARK = 0
 
 
-def _make_img_sparse(img: List[List[int]]) -> Tuple[set, int, int]:
-        x = len(img)
-        y = len(img[0])
-        img_sparse = set()
+# Weight of each pixel of the 3x3 window in the algorithm index
+WINDOW_WEIGHTS = [1 << (8 - i) for i in range(len(WINDOW_3X3))]
 
-        for i in range(x):
-            for j in range(y):
-                if img[i][j] == LIGHT:
-                    img_sparse.add((i, j))
 
-        return img_sparse, x, y
+class Image:
+    def __init__(self, img: Grid, img_enhancement_algorithm: List[int], infinity_pixel: int = DARK) -> None:
+        self.img = img
+        self.infinity_pixel = infinity_pixel
+        self.img_enhancement_algorithm = np.asarray(img_enhancement_algorithm, dtype=np.uint8)
 
+    def enhance(self) -> 'Image':
+        # The image grows by one pixel on every side, the surrounding pixels
+        # taking the value of the infinity
+        grown = Grid(self.img.padded(self.infinity_pixel))
 
-class Image:
-    def __init__(self, img: List[List[int]], img_enhancement_algorithm: List[int]) -> None:
-        self.img, self.x, self.y = _make_img_sparse(img)
-        self.infinity_pixel = DARK
-        self.img_enhancement_algorithm = img_enhancement_algorithm
-
-    def _get_pixel_value(self, i: int, j: int) -> int:
-        if i < 0 or i >= self.x or j < 0 or j >= self.y:
-            return self.infinity_pixel
-        return LIGHT if (i, j) in self.img else DARK
-
-    def _get_3x3(self, r: int, c: int) -> List[int]:        
-        field = []
-
-        for i in range(r-1, r+2):
-            for j in range(c-1, c+2):
-                field.append(self._get_pixel_value(i, j))
-
-        return field
-
-    def _get_algo_idx(self, field: List[int]) -> int:
-        idx = 0
-        for i, v in enumerate(field):
-            idx += (1 << (8 - i)) * v
-        return idx
-
-    def _get_new_pixel_value(self, i: int, j: int) -> int:
-        idx = self._get_algo_idx(self._get_3x3(i, j))
-        return self.img_enhancement_algorithm[idx]
-
-    def enhance(self) -> None:
-        new_img = set()
-        for i in range(-1, self.x + 1):
-            for j in range(-1, self.y + 1):
-                if self._get_new_pixel_value(i, j) == LIGHT:
-                    new_img.add((i+1, j+1))
-
-        self.img = new_img
-        self.x += 2
-        self.y += 2
+        idx = np.zeros(grown.shape, dtype=np.int64)
+        for weight, pixel in zip(WINDOW_WEIGHTS, grown.shifted(WINDOW_3X3, self.infinity_pixel)):
+            idx += weight * pixel.astype(np.int64)
 
         if self.infinity_pixel == DARK:
-            self.infinity_pixel = self.img_enhancement_algorithm[0]
+            infinity_pixel = self.img_enhancement_algorithm[0]
         else:
             assert self.infinity_pixel == LIGHT
-            self.infinity_pixel = self.img_enhancement_algorithm[-1]
+            infinity_pixel = self.img_enhancement_algorithm[-1]
+
+        return Image(Grid(self.img_enhancement_algorithm[idx]), self.img_enhancement_algorithm, infinity_pixel)
 
     def get_light_pixel(self) -> int:
         assert self.infinity_pixel != LIGHT
-        return len(self.img)
+        return int(self.img.cells.sum())
 
 
 def read_input(path: str) -> Image:
-    parse = lambda c: LIGHT if c == '#' else DARK
-    with open(path, "r") as file_handle:
-        image_enhancement_algorithm = [parse(c) for c in file_handle.readline()[:-1]]
-        file_handle.readline()  # Skip empty line
-        input_img = [[parse(c) for c in line[:-1]] for line in file_handle.readlines()]
-    return Image(input_img, image_enhancement_algorithm)
+    with loader.mapped(path) as buf:
+        algorithm_end = buf.find(b'\n')
+        image_enhancement_algorithm = [LIGHT if c == ord('#') else DARK for c in buf[:algorithm_end]]
+        # Skip the empty line
+        input_img = Grid.from_chars(buf, '#', algorithm_end + 2).cells.astype(np.uint8)
+    return Image(Grid(input_img), image_enhancement_algorithm)
 
 
 def solve1(img: Image) -> int:
-    img.enhance()
-    img.enhance()
-    return img.get_light_pixel()
+    return img.enhance().enhance().get_light_pixel()
 
 
 def solve2(img: Image) -> int:
     for _ in range(50):
-        img.enhance()
+        img = img.enhance()
     return img.get_light_pixel()
 
 
 if __name__ == "__main__":
     input_path = sys.argv[1]
-    print(solve1(read_input(input_path)))
-    print(solve2(read_input(input_path)))
\ No newline at end of file
+    img = read_input(input_path)
+    print(solve1(img))
+    print(solve2(img))
\ No newline at end of file
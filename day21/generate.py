@@ -0,0 +1,20 @@
+import random
+import sys
+from typing import TextIO
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes two starting positions. The game has no size parameter, so `size`
+    is ignored; generate many files to stress the solvers instead.
+    """
+    for player in (1, 2):
+        file_handle.write(f"Player {player} starting position: {rng.randint(1, 10)}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,13 +1,20 @@
+import os
 import sys
-from typing import Tuple
+import functools
+from typing import List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 def read_input(path: str) -> Tuple[int, int]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    p1 = int(file_content[0][-2]) - 1
-    p2 = int(file_content[1][-2]) - 1
-    return p1, p2
+    # "Player <i> starting position: <pos>"
+    with loader.mapped(path) as buf:
+        _, p1, _, p2 = loader.parse_ints(buf)
+    return p1 - 1, p2 - 1
 
 
 def solve1(p1: int, p2: int) -> int:
@@ -74,6 +81,44 @@ def solve2(p1: int, p2: int) -> int:
     return max(*_move_player({}, 0, p1, 0, p2, 0))
 
 
+"""
+Batch mode: there are only 10x10 starting positions, so both parts are
+tabulated once for all of them (part 2 sharing a single memo) and a batch
+is answered by indexing the tables with the stacked positions.
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _answer_table(part: int) -> 'np.ndarray':
+    table = np.zeros((10, 10), dtype=np.int64)
+    memo = {}
+    for p1 in range(10):
+        for p2 in range(10):
+            if part == 1:
+                table[p1, p2] = solve1(p1, p2)
+            else:
+                table[p1, p2] = max(*_move_player(memo, 0, p1, 0, p2, 0))
+    return table
+
+
+def precompute() -> None:
+    _answer_table(1)
+    _answer_table(2)
+
+
+def _lookup_batch(part: int, inputs: List[Tuple[int, int]]) -> List[int]:
+    positions = np.array(inputs, dtype=np.int64).reshape(-1, 2)
+    return _answer_table(part)[positions[:, 0], positions[:, 1]].tolist()
+
+
+def solve1_batch(inputs: List[Tuple[int, int]]) -> List[int]:
+    return _lookup_batch(1, inputs)
+
+
+def solve2_batch(inputs: List[Tuple[int, int]]) -> List[int]:
+    return _lookup_batch(2, inputs)
+
+
 if __name__ == "__main__":
     input_path = sys.argv[1]
     p1, p2 = read_input(input_path)
@@ -0,0 +1,42 @@
+import random
+import sys
+from typing import TextIO
+
+
+INIT_REGION = 50
+MAX_COORD = 100000
+INIT_COMMANDS = 20
+# Every step splits the cuboids so far, so the solvers slow down much faster
+# than the number of steps grows
+MAX_SIZE = 500
+
+
+def _range(rng: random.Random, bound: int, max_length: int) -> str:
+    start = rng.randint(-bound, bound - 1)
+    end = min(bound, start + rng.randint(0, max_length))
+    return f"{start}..{end}"
+
+
+def generate(file_handle: TextIO, size: int, rng: random.Random) -> None:
+    """
+    Writes `size` reboot steps. As in the puzzle, the first steps lie within
+    the initialization region and the rest span the whole reactor. `size` is
+    capped at MAX_SIZE.
+    """
+    size = min(size, MAX_SIZE)
+    for i in range(size):
+        if i < INIT_COMMANDS:
+            bound, max_length = INIT_REGION, INIT_REGION
+        else:
+            bound, max_length = MAX_COORD, MAX_COORD // 2
+        state = "on" if i == 0 or rng.random() < 0.6 else "off"
+        ranges = [_range(rng, bound, max_length) for _ in range(3)]
+        file_handle.write(f"{state} x={ranges[0]},y={ranges[1]},z={ranges[2]}\n")
+
+
+if __name__ == "__main__":
+    output_path = sys.argv[1]
+    size = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    with open(output_path, "w") as file_handle:
+        generate(file_handle, size, random.Random(seed))
@@ -1,9 +1,15 @@
+import os
 import sys
-from typing import List, Tuple, Optional
-import numpy as np
+from typing import Dict, Iterator, List, Tuple, Optional
 from copy import deepcopy
 import bisect
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from aoc import loader
+from aoc.lazy import lazy_import
+
+np = lazy_import("numpy")
+
 
 Range = List[int]
 
@@ -27,31 +33,48 @@ def parse_command(cmd: str) -> Tuple[bool, List[Range]]:
 
 
 def read_input(path: str) -> List[Tuple[bool, List[Range]]]:
-    with open(path, "r") as file_handle:
-        file_content = file_handle.readlines()
-    return [parse_command(line[:-1]) for line in file_content]
+    return [parse_command(line) for line in loader.read_lines(path)]
+
+
+def pack_input(commands: List[Tuple[bool, List[Range]]]) -> 'Dict[str, np.ndarray]':
+    # One row per command: turn_on, x_from, x_to, y_from, y_to, z_from, z_to
+    rows = [[turn_on] + [bound for r in ranges for bound in r] for turn_on, ranges in commands]
+    return {"commands": np.array(rows, dtype=np.int64).reshape(-1, 7)}
+
+
+def unpack_input(arrays: 'Dict[str, np.ndarray]') -> List[Tuple[bool, List[Range]]]:
+    return [(turn_on != 0, [[x_from, x_to], [y_from, y_to], [z_from, z_to]])
+            for turn_on, x_from, x_to, y_from, y_to, z_from, z_to in arrays["commands"].tolist()]
+
+
+def _init_cubes() -> 'np.ndarray':
+    return np.full((101, 101, 101), False, dtype=bool)
+
+
+def _switch_init_region(cubes: 'np.ndarray', turn_on: bool, ranges: List[Range]) -> None:
+    x_from, x_to = ranges[0]
+    if x_from > 50 or x_to < -50:
+        return
+    x_from, x_to = max(-50, x_from) + 50, min(50, x_to) + 50
+    
+    y_from, y_to = ranges[1]
+    if y_from > 50 or y_to < -50:
+        return
+    y_from, y_to = max(-50, y_from) + 50, min(50, y_to) + 50
+    
+    z_from, z_to = ranges[2]
+    if z_from > 50 or z_to < -50:
+        return
+    z_from, z_to = max(-50, z_from) + 50, min(50, z_to) + 50
+
+    cubes[x_from:x_to+1, y_from:y_to+1, z_from:z_to+1] = turn_on
 
 
 def solve1(commands: List[Tuple[bool, List[Range]]]) -> int:
-    cubes = np.full((101, 101, 101), False, dtype=bool)
+    cubes = _init_cubes()
 
     for turn_on, ranges in commands:
-        x_from, x_to = ranges[0]
-        if x_from > 50 or x_to < -50:
-            continue
-        x_from, x_to = max(-50, x_from) + 50, min(50, x_to) + 50
-        
-        y_from, y_to = ranges[1]
-        if y_from > 50 or y_to < -50:
-            continue
-        y_from, y_to = max(-50, y_from) + 50, min(50, y_to) + 50
-        
-        z_from, z_to = ranges[2]
-        if z_from > 50 or z_to < -50:
-            continue
-        z_from, z_to = max(-50, z_from) + 50, min(50, z_to) + 50
-
-        cubes[x_from:x_to+1, y_from:y_to+1, z_from:z_to+1] = turn_on
+        _switch_init_region(cubes, turn_on, ranges)
 
     return cubes.sum()
 
@@ -206,13 +229,36 @@ class CubeIntervalTree:
 
 
 def solve2(commands: List[Tuple[bool, List[Range]]]) -> int:
-    tree = CubeIntervalTree(interval=commands[0][1], turn_on=commands[0][0])
+    # The tree splits the ranges it is given in place, so hand it copies
+    tree = CubeIntervalTree(interval=[list(r) for r in commands[0][1]], turn_on=commands[0][0])
     commands = commands[1:]
     for turn_on, interval_3d in commands:
-        tree.update_interval(interval_3d, turn_on)
+        tree.update_interval([list(r) for r in interval_3d], turn_on)
     return tree.count_turned_on_cubes()
 
 
+def solve_stream(lines: Iterator[str]) -> Tuple[int, int]:
+    # Each command is applied as it comes in: the part 1 region is a fixed
+    # size grid, and the part 2 tree only holds the cuboids split so far
+    cubes = _init_cubes()
+    tree = None
+
+    for line in lines:
+        if line == "":
+            continue
+        turn_on, ranges = parse_command(line)
+        _switch_init_region(cubes, turn_on, ranges)
+        if tree is None:
+            tree = CubeIntervalTree(interval=ranges, turn_on=turn_on)
+        else:
+            tree.update_interval(ranges, turn_on)
+
+    if tree is None:
+        # No commands: every cube is still off
+        return 0, 0
+    return int(cubes.sum()), tree.count_turned_on_cubes()
+
+
 """
 Part 2, Approach 2
 """